@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import base64
-from typing import Optional
+from typing import Annotated, Literal, Optional
 
 from fastapi import (
     APIRouter,
+    Depends,
     HTTPException,
     Query,
     Request,
@@ -34,6 +35,13 @@ from app.container import (
     get_transcode_service,
 )
 from app.providers import AudioChunk 
+from app.services import TTSService
+from app.services.rate_limiter import RateLimiter
+from app.services.session_queue import (
+    StreamEnqueuer,
+    SessionQueueFullError,
+    get_stream_enqueuer,
+)
 
 
 logger = get_logger(__name__)
@@ -90,10 +98,11 @@ async def list_voices(
 async def create_session(
     req: CreateTTSSessionRequest,
     request: Request,
+    limiter: RateLimiter = Depends(get_rate_limiter),
+    tts_service: TTSService = Depends(get_tts_service),
 ) -> CreateTTSSessionResponse:
     # Simple IP-based rate limiting for session creation.
     client_host = request.client.host if request.client else "unknown"
-    limiter = get_rate_limiter()
     if not limiter.allow_request(client_host):
         raise HTTPException(
             status_code=429,
@@ -103,7 +112,7 @@ async def create_session(
         normalized_req = await _normalize_tts_request(req, get_provider_registry())
         # Session creation itself is cheap; we do it directly here and reserve
         # the bounded queue / worker pool for the heavier streaming stage.
-        session = get_tts_service().create_session(normalized_req)
+        session = tts_service.create_session(normalized_req)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -205,15 +214,28 @@ async def metrics() -> PlainTextResponse:
 
 
 @router.websocket("/v1/tts/stream/{session_id}")
-async def stream_tts(websocket: WebSocket, session_id: str) -> None:
+async def stream_tts(
+    websocket: WebSocket,
+    session_id: str,
+    audio_encoding: Annotated[Literal["binary", "base64"], Query()] = "binary",
+    tts_service: TTSService = Depends(get_tts_service),
+    enqueue_stream_request: StreamEnqueuer = Depends(get_stream_enqueuer),
+) -> None:
+    """Stream a session's audio over a WebSocket.
+
+    Audio is sent as binary frames of raw encoded bytes; ``eos`` and ``error``
+    are JSON text frames. Clients that predate binary frames can pass
+    ``?audio_encoding=base64`` to receive JSON "audio" messages instead.
+    """
     await websocket.accept()
-    from app.services.session_queue import (
-        enqueue_stream_request,
-        SessionQueueFullError,
-    )
 
     try:
-        await enqueue_stream_request(session_id, websocket)
+        await enqueue_stream_request(
+            session_id,
+            websocket,
+            tts_service=tts_service,
+            binary_audio=audio_encoding == "binary",
+        )
     except SessionQueueFullError:
         # Queue is full; reject this stream with a clear error.
         err = ErrorMessage(
@@ -251,7 +273,7 @@ async def get_session_file(
     registry = get_provider_registry()
     provider = registry.get(session.provider)
 
-    pcm_buf = bytearray()
+    pcm_parts: list[bytes] = []
     sample_rate = None
     num_channels = 1
 
@@ -263,13 +285,15 @@ async def get_session_file(
         if sample_rate is None:
             sample_rate = chunk.sample_rate_hz
             num_channels = chunk.num_channels
-        pcm_buf.extend(chunk.data)
+        pcm_parts.append(chunk.data)
 
     if sample_rate is None:
         raise HTTPException(status_code=500, detail="Provider produced no audio data")
 
     full_chunk = AudioChunk(
-        data=bytes(pcm_buf),
+        # One copy into the final buffer, rather than growing a bytearray
+        # chunk by chunk and then copying it out again.
+        data=b"".join(pcm_parts),
         sample_rate_hz=sample_rate,
         num_channels=num_channels,
         format=AudioFormat.PCM16,
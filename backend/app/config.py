@@ -27,6 +27,20 @@ class AppConfig:
         os.getenv("SESSION_QUEUE_WORKER_COUNT", "8")
     )
 
+    # Provider streaming deadlines. Each chunk after the first must arrive
+    # within provider_timeout_seconds. The first chunk may take up to
+    # (provider_warmup_extensions + 1) * provider_timeout_seconds per attempt
+    # without discarding warm-up work, so a provider that never produces audio
+    # fails after provider_max_retries * (provider_warmup_extensions + 1)
+    # * provider_timeout_seconds in the worst case (40s with the defaults).
+    provider_timeout_seconds: float = float(
+        os.getenv("PROVIDER_TIMEOUT_SECONDS", "10.0")
+    )
+    provider_max_retries: int = int(os.getenv("PROVIDER_MAX_RETRIES", "2"))
+    provider_warmup_extensions: int = int(
+        os.getenv("PROVIDER_WARMUP_EXTENSIONS", "1")
+    )
+
     mock_tone_enabled: bool = os.getenv("MOCK_TONE_ENABLED", "1") != "0"
 
     coqui_enabled: bool = os.getenv("COQUI_ENABLED", "1") != "0"
@@ -50,4 +50,7 @@ def get_tts_service() -> TTSService:
         session_repo=get_session_repo(),
         transcode_service=get_transcode_service(),
         circuit_breakers=get_circuit_breaker_registry(),
+        provider_timeout_seconds=settings.provider_timeout_seconds,
+        provider_max_retries=settings.provider_max_retries,
+        provider_warmup_extensions=settings.provider_warmup_extensions,
     )
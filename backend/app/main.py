@@ -16,7 +16,11 @@ from app.container import (
     get_rate_limiter,
 )
 from app.config import settings
-from app.services.session_queue import configure_session_queue
+from app import metrics as app_metrics
+from app.services.session_queue import (
+    configure_session_queue,
+    shutdown_session_queue,
+)
 
 
 logger = get_logger(__name__)
@@ -77,6 +81,9 @@ def create_app() -> FastAPI:
             type(transcode_service).__name__,
             type(rate_limiter).__name__,
         )
+        app_metrics.prime_stream_chunk_metrics(
+            p.id for p in provider_registry.list_providers()
+        )
 
         # Configure bounded streaming queue and worker pool.
         configure_session_queue(
@@ -103,10 +110,19 @@ def create_app() -> FastAPI:
                 except Exception:
                     logger.exception("Error while sampling rate-limit metrics")
 
-        asyncio.create_task(rate_limit_metrics_loop())
+        app.state.rate_limit_metrics_task = asyncio.create_task(
+            rate_limit_metrics_loop()
+        )
 
     @app.on_event("shutdown")
     async def on_shutdown() -> None:
+        metrics_task = getattr(app.state, "rate_limit_metrics_task", None)
+        if metrics_task is not None:
+            metrics_task.cancel()
+        try:
+            await shutdown_session_queue()
+        except Exception:
+            logger.exception("Error while shutting down session queue")
         try:
             tts = get_tts_service()
             close = getattr(tts, "close", None)
@@ -114,6 +130,10 @@ def create_app() -> FastAPI:
                 close()
         except Exception:
             logger.exception("Error while shutting down TTS service")
+        try:
+            get_transcode_service().close()
+        except Exception:
+            logger.exception("Error while shutting down transcode service")
 
     return app
 
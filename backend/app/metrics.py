@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from typing import Dict, Iterable, Tuple
+
 from prometheus_client import Counter, Gauge
 
 from app.logging_utils import get_logger
+from app.models.audio_format import AudioFormat
 
 
 logger = get_logger(__name__)
@@ -85,11 +88,46 @@ def decrement_active_streams(provider_id: str) -> None:
     TTS_ACTIVE_STREAMS.labels(provider=provider_id).dec()
 
 
-def record_stream_chunk(provider_id: str, target_format: str, num_bytes: int) -> None:
-    TTS_STREAM_CHUNKS_TOTAL.labels(provider=provider_id, format=target_format).inc()
-    TTS_STREAM_BYTES_TOTAL.labels(provider=provider_id, format=target_format).inc(
-        num_bytes
+# Pre-bound (provider, format) children for the per-chunk streaming counters.
+# record_stream_chunk runs once per audio chunk, so we resolve the labelled
+# children once instead of paying for `.labels(...)` on every call.
+_STREAM_CHUNK_CHILDREN: Dict[Tuple[str, str], Tuple[Counter, Counter]] = {}
+
+
+def _bind_stream_chunk_children(
+    provider_id: str, target_format: str
+) -> Tuple[Counter, Counter]:
+    fmt = getattr(target_format, "value", target_format)
+    children = (
+        TTS_STREAM_CHUNKS_TOTAL.labels(provider=provider_id, format=fmt),
+        TTS_STREAM_BYTES_TOTAL.labels(provider=provider_id, format=fmt),
     )
+    _STREAM_CHUNK_CHILDREN[(provider_id, target_format)] = children
+    return children
+
+
+def prime_stream_chunk_metrics(provider_ids: Iterable[str]) -> None:
+    """Pre-bind streaming counters for every provider x AudioFormat pair."""
+    for provider_id in provider_ids:
+        for fmt in AudioFormat:
+            _bind_stream_chunk_children(provider_id, fmt)
+
+
+def stream_chunk_counters(
+    provider_id: str, target_format: str
+) -> Tuple[Counter, Counter]:
+    """Return the bound (chunks_total, bytes_total) children for a stream."""
+    children = _STREAM_CHUNK_CHILDREN.get((provider_id, target_format))
+    if children is None:
+        # Providers not known at startup (e.g. test doubles) bind lazily.
+        children = _bind_stream_chunk_children(provider_id, target_format)
+    return children
+
+
+def record_stream_chunk(provider_id: str, target_format: str, num_bytes: int) -> None:
+    chunks_total, bytes_total = stream_chunk_counters(provider_id, target_format)
+    chunks_total.inc()
+    bytes_total.inc(num_bytes)
 
 
 def record_provider_failure(provider_id: str) -> None:
@@ -117,14 +155,14 @@ def record_rate_limit_hit(scope: str) -> None:
 def record_rate_limit_max_bucket_usage(scope: str, usage_fraction: float) -> None:
     """Record the current maximum bucket usage across all keys for a limiter.
 
-    `usage_fraction` should be in the range [0, 1], representing the ratio of
-    the most heavily used key's count to the configured max_requests_per_window.
+    `usage_fraction` should be in the range [0, 1], representing how much of
+    the most heavily used key's token bucket is currently spent.
     """
     TTS_RATE_LIMIT_MAX_BUCKET_USAGE.labels(scope=scope).set(usage_fraction)
 
 
 def record_rate_limit_window_remaining(scope: str, remaining_seconds: float) -> None:
-    """Record approximate remaining time until the rate-limit window resets."""
+    """Record approximate time until the busiest rate-limit bucket is full again."""
     TTS_RATE_LIMIT_WINDOW_REMAINING_SECONDS.labels(scope=scope).set(
         max(0.0, remaining_seconds)
     )
@@ -1,4 +1,4 @@
-from .base import AudioChunk, ProviderVoice, BaseTTSProvider
+from .base import AudioChunk, ProviderVoice, BaseTTSProvider, ProviderRetriableError
 from app.models.audio_format import AudioFormat
 from .mock_tone import MockToneProvider
 from .coqui_tts import CoquiTTSProvider
@@ -9,6 +9,7 @@ __all__ = [
     "AudioFormat",
     "ProviderVoice",
     "BaseTTSProvider",
+    "ProviderRetriableError",
     "MockToneProvider",
     "CoquiTTSProvider",
     "ProviderRegistry",
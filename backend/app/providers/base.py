@@ -6,6 +6,10 @@ from typing import AsyncIterator, Protocol
 from app.models.audio_format import AudioFormat
 
 
+class ProviderRetriableError(RuntimeError):
+    """Raised by providers for transient failures that are safe to retry."""
+
+
 @dataclass
 class ProviderVoice:
     """Metadata for a single voice exposed by a provider."""
@@ -32,9 +36,16 @@ class AudioChunk:
 
 
 class BaseTTSProvider(Protocol):
-    """Interface for TTS providers that stream audio chunks."""
+    """Interface for TTS providers that stream audio chunks.
+
+    ``native_format`` / ``native_sample_rate_hz`` describe the audio the
+    provider emits, letting the gateway skip transcoding when a session
+    already requests that exact format.
+    """
 
     id: str
+    native_format: AudioFormat
+    native_sample_rate_hz: int
 
     async def list_voices(self) -> list[ProviderVoice]:
         """Return the voices supported by this provider."""
@@ -2,10 +2,14 @@ from __future__ import annotations
 
 from typing import AsyncIterator
 
-from .base import AudioChunk, BaseTTSProvider, ProviderVoice
+from .base import (
+    AudioChunk,
+    BaseTTSProvider,
+    ProviderRetriableError,
+    ProviderVoice,
+)
 from app.models.audio_format import AudioFormat
 from app.config import settings
-from TTS.api import TTS as CoquiTTS  # type: ignore[import]
 
 
 def _should_use_gpu() -> bool:
@@ -30,6 +34,7 @@ class CoquiTTSProvider(BaseTTSProvider):
     """
 
     id: str = "coqui_tts"
+    native_format: AudioFormat = AudioFormat.PCM16
 
     def __init__(
         self,
@@ -37,6 +42,10 @@ class CoquiTTSProvider(BaseTTSProvider):
         language: str | None = None,
         chunk_size_frames: int = 1600,
     ) -> None:
+        # Import lazily: TTS pulls in torch, which is expensive and should
+        # only be paid when the Coqui provider is actually enabled.
+        from TTS.api import TTS as CoquiTTS  # type: ignore[import]
+
         # A commonly used English Coqui model; users can override this. If an
         # explicit COQUI_MODEL_PATH is provided, load from that path instead of
         # downloading by model name.
@@ -58,6 +67,7 @@ class CoquiTTSProvider(BaseTTSProvider):
 
         # Coqui exposes the output sample rate via synthesizer.
         self._sample_rate_hz = int(getattr(self._tts.synthesizer, "output_sample_rate", 22050))
+        self.native_sample_rate_hz = self._sample_rate_hz
         self._chunk_size_frames = chunk_size_frames
 
         self._voices: list[ProviderVoice] = [
@@ -92,13 +102,21 @@ class CoquiTTSProvider(BaseTTSProvider):
 
         # Synthesize full utterance to a temporary WAV file.
         with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
-            self._tts.tts_to_file(
-                text=text,
-                file_path=tmp.name,
-                # Some models use multi-speaker / multi-language; for the
-                # simplest setup we rely on defaults.
-                language=lang if "multi" in self._model_name else None,
-            )
+            try:
+                self._tts.tts_to_file(
+                    text=text,
+                    file_path=tmp.name,
+                    # Some models use multi-speaker / multi-language; for the
+                    # simplest setup we rely on defaults.
+                    language=lang if "multi" in self._model_name else None,
+                )
+            except (RuntimeError, OSError) as exc:
+                # Torch runtime errors (e.g. CUDA/allocator failures) and I/O
+                # errors on the temp file are transient; nothing has been
+                # yielded yet, so the gateway may retry with a fresh stream.
+                raise ProviderRetriableError(
+                    f"Coqui synthesis failed: {exc}"
+                ) from exc
             tmp.flush()
             tmp.seek(0)
 
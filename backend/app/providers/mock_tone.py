@@ -1,12 +1,40 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import AsyncIterator
 
+try:  # Optional: vectorised tone synthesis.
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
 from .base import AudioChunk, BaseTTSProvider, ProviderVoice
 from app.models.audio_format import AudioFormat
 from ..audio import pcm16le_from_floats, tone, silence
 
 
+_BASE_FREQ_HZ = 220.0
+_GAIN = 0.2
+_CHAR_S = 0.080  # duration per character
+_GAP_S = 0.020  # gap between characters
+
+
+@lru_cache(maxsize=128)
+def _char_pcm16(semitone: int, sample_rate: int) -> bytes:
+    """PCM16 for one character: its tone followed by the inter-character gap.
+
+    Only 24 distinct semitones exist, so each is synthesised once per sample
+    rate and reused for every later character that maps to it.
+    """
+    freq = _BASE_FREQ_HZ * (2 ** (semitone / 12.0))
+    gap = silence(_GAP_S, sample_rate)
+    if np is None:
+        return pcm16le_from_floats(tone(freq, _CHAR_S, sample_rate, gain=_GAIN) + gap)
+    t = np.arange(int(_CHAR_S * sample_rate)) / sample_rate
+    wave = np.sin((2.0 * np.pi * freq) * t) * _GAIN
+    return np.rint(wave * 32767.0).astype("<i2").tobytes() + bytes(2 * len(gap))
+
+
 class MockToneProvider(BaseTTSProvider):
     """Mock provider that encodes text as a sequence of tones.
 
@@ -16,9 +44,11 @@ class MockToneProvider(BaseTTSProvider):
     """
 
     id: str = "mock_tone"
+    native_format: AudioFormat = AudioFormat.PCM16
 
     def __init__(self, sample_rate_hz: int = 16000) -> None:
         self._sample_rate_hz = sample_rate_hz
+        self.native_sample_rate_hz = sample_rate_hz
         self._voices: list[ProviderVoice] = [
             ProviderVoice(
                 id="en-US-mock-1",
@@ -45,22 +75,9 @@ class MockToneProvider(BaseTTSProvider):
         # For MVP, ignore voice_id/language validation beyond presence.
         sample_rate = self._sample_rate_hz
 
-        base_freq = 220.0
-        gain = 0.2
-        char_ms = 80.0  # duration per character in ms
-        gap_ms = 20.0   # gap between characters in ms
-
-        samples: list[float] = []
-        for ch in text:
-            code = ord(ch)
-            semitone = (code % 24) - 12
-            freq = base_freq * (2 ** (semitone / 12.0))
-            dur_s = char_ms / 1000.0
-            gap_s = gap_ms / 1000.0
-            samples.extend(tone(freq, dur_s, sample_rate, gain=gain))
-            samples.extend(silence(gap_s, sample_rate))
-
-        pcm = pcm16le_from_floats(samples)
+        pcm = b"".join(
+            _char_pcm16((ord(ch) % 24) - 12, sample_rate) for ch in text
+        )
 
         # Stream fixed-size chunks (~100ms of audio at 16kHz mono).
         bytes_per_second = sample_rate * 2  # 16-bit mono PCM
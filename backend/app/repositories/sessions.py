@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from threading import RLock
-from typing import Dict, Optional, Protocol
+from typing import Callable, Dict, Optional, Protocol
 
 from ..models import TTSSession, SessionStatus
 
@@ -12,7 +12,11 @@ class TTSSessionRepository(Protocol):
     def get(self, session_id: str) -> Optional[TTSSession]:
         ...
 
-    def save(self, session: TTSSession) -> None:
+    def save(
+        self,
+        session: TTSSession,
+        on_saved: Optional[Callable[[TTSSession], None]] = None,
+    ) -> None:
         ...
 
     def update_status(self, session_id: str, status: SessionStatus) -> None:
@@ -27,12 +31,20 @@ class InMemoryTTSSessionRepository(TTSSessionRepository):
         self._lock = RLock()
 
     def get(self, session_id: str) -> Optional[TTSSession]:
-        with self._lock:
-            return self._items.get(session_id)
-
-    def save(self, session: TTSSession) -> None:
+        # A single dict lookup is atomic under the GIL, so reads skip the lock;
+        # it only needs to serialise the read-modify-write paths below.
+        return self._items.get(session_id)
+
+    def save(
+        self,
+        session: TTSSession,
+        on_saved: Optional[Callable[[TTSSession], None]] = None,
+    ) -> None:
+        """Persist `session`, then notify `on_saved` (e.g. a metrics hook)."""
         with self._lock:
             self._items[session.id] = session
+        if on_saved is not None:
+            on_saved(session)
 
     def update_status(self, session_id: str, status: SessionStatus) -> None:
         with self._lock:
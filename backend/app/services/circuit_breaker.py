@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from threading import RLock
-from typing import Dict
+from typing import Callable, Dict
 
 from app.logging_utils import get_logger
 
@@ -11,13 +11,24 @@ from app.logging_utils import get_logger
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class CircuitBreakerState:
-  """In-memory state for a single circuit breaker."""
+  """In-memory state for a single circuit breaker.
+
+  Slotted: one compact record per key, with the counters stored inline
+  rather than in a per-instance ``__dict__``.
+  """
 
   failure_count: int = 0
-  opened_at: float = 0.0
+  # Clock time at which an OPEN circuit may move to HALF_OPEN.
+  opened_until: float = 0.0
   state: str = "closed"  # "closed" | "open" | "half_open"
+  # Set while the single half-open trial request is outstanding; the probe is
+  # considered abandoned once the clock passes probe_expires_at.
+  probe_in_flight: bool = False
+  probe_expires_at: float = 0.0
+  # Successful probes still required before a half-open circuit closes.
+  recovery_remaining: int = 0
 
 
 @dataclass
@@ -26,16 +37,25 @@ class CircuitBreakerConfig:
 
   failure_threshold: int = 5
   reset_timeout_seconds: int = 30
+  # Consecutive successful half-open probes required before closing again.
+  recovery_probes: int = 1
 
 
 class CircuitBreakerRegistry:
   """Tracks circuit breaker state per key (e.g., provider id).
 
-  This is intentionally simple and in-memory for the assignment.
+  This is intentionally simple and in-memory for the assignment. Deadlines are
+  measured on a monotonic clock, so wall-clock adjustments (NTP steps) cannot
+  hold a circuit open or release it early.
   """
 
-  def __init__(self, config: CircuitBreakerConfig | None = None) -> None:
+  def __init__(
+    self,
+    config: CircuitBreakerConfig | None = None,
+    clock: Callable[[], float] = time.monotonic,
+  ) -> None:
     self._config = config or CircuitBreakerConfig()
+    self._clock = clock
     self._lock = RLock()
     self._states: Dict[str, CircuitBreakerState] = {}
 
@@ -49,26 +69,64 @@ class CircuitBreakerRegistry:
 
   def allow_request(self, key: str) -> bool:
     """Return True if a call should be attempted for this key."""
-    state = self._get_state(key)
-    now = time.time()
+    # Fast path: a single dict read is atomic under the GIL, so the common
+    # CLOSED case is answered without taking the lock. Rejections are lock-free
+    # too, since they only compare the clock with a stored deadline; only
+    # admitting a request out of OPEN/HALF_OPEN mutates state, under the lock.
+    state = self._states.get(key)
+    if state is None or state.state == "closed":
+      return True
+
+    if self._rejects(state, self._clock()):
+      if state.state == "open":
+        logger.warning("Circuit breaker OPEN – rejecting request for key=%s", key)
+      return False
 
-    if state.state == "open":
-      if now - state.opened_at >= self._config.reset_timeout_seconds:
-        # Move to half-open and allow a trial request.
+    with self._lock:
+      now = self._clock()
+      if state.state == "closed":
+        return True
+      if self._rejects(state, now):
+        return False
+      if state.state == "open":
         logger.warning("Circuit breaker HALF_OPEN for key=%s", key)
         state.state = "half_open"
-        return True
-      # Still within open window: reject.
-      logger.warning("Circuit breaker OPEN – rejecting request for key=%s", key)
-      return False
-
-    # closed or half_open: allow request
-    return True
+        state.recovery_remaining = max(1, self._config.recovery_probes)
+      # Admit a single trial request. A probe that never reports back (e.g.
+      # the client went away mid-stream) expires after another reset timeout.
+      state.probe_in_flight = True
+      state.probe_expires_at = now + self._config.reset_timeout_seconds
+      return True
+
+  @staticmethod
+  def _rejects(state: CircuitBreakerState, now: float) -> bool:
+    if state.state == "open":
+      return now < state.opened_until
+    return state.probe_in_flight and now < state.probe_expires_at
 
   def record_success(self, key: str) -> None:
-    """Record a successful call."""
-    state = self._get_state(key)
+    """Record a successful call.
+
+    In HALF_OPEN the circuit only closes after ``recovery_probes`` successful
+    trial requests, so a recovering provider is ramped back up one probe at a
+    time instead of snapping straight back to full traffic.
+    """
+    # Fast path: a healthy breaker has nothing to reset, so the usual
+    # success report neither creates state nor takes the lock.
+    state = self._states.get(key)
+    if state is None or (state.state == "closed" and not state.failure_count):
+      return
     with self._lock:
+      if state.state == "half_open":
+        state.recovery_remaining -= 1
+        state.probe_in_flight = False
+        if state.recovery_remaining > 0:
+          logger.info(
+            "Circuit breaker probe SUCCESS for key=%s (%d more required)",
+            key,
+            state.recovery_remaining,
+          )
+          return
       if state.failure_count or state.state != "closed":
         logger.info(
           "Circuit breaker SUCCESS for key=%s (state=%s, failures=%d)",
@@ -78,13 +136,15 @@ class CircuitBreakerRegistry:
         )
       state.failure_count = 0
       state.state = "closed"
-      state.opened_at = 0.0
+      state.opened_until = 0.0
+      state.probe_in_flight = False
 
   def record_failure(self, key: str) -> None:
     """Record a failed call and potentially open the circuit."""
     state = self._get_state(key)
     with self._lock:
       state.failure_count += 1
+      state.probe_in_flight = False
       logger.warning(
         "Circuit breaker failure for key=%s (count=%d)",
         key,
@@ -92,7 +152,7 @@ class CircuitBreakerRegistry:
       )
       if state.failure_count >= self._config.failure_threshold:
         state.state = "open"
-        state.opened_at = time.time()
+        state.opened_until = self._clock() + self._config.reset_timeout_seconds
         logger.error(
           "Circuit breaker OPEN for key=%s after %d failures",
           key,
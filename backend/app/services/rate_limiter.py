@@ -3,7 +3,7 @@ from __future__ import annotations
 import time
 from dataclasses import dataclass
 from threading import RLock
-from typing import Dict, Tuple
+from typing import Callable, Dict, Tuple
 
 from app.logging_utils import get_logger
 from app import metrics as app_metrics
@@ -21,87 +21,89 @@ class RateLimitConfig:
 
 
 class RateLimiter:
-    """Simple in-memory fixed-window rate limiter keyed by client id.
+    """Simple in-memory token-bucket rate limiter keyed by client id.
+
+    Each key gets a bucket holding up to ``max_requests_per_window`` tokens
+    that refills continuously at ``max_requests_per_window / window_seconds``
+    tokens per second; a request spends one token. Unlike a fixed window this
+    cannot admit two full windows' worth of requests around a window edge,
+    and per-key state is just ``(tokens, last_refill)``.
 
     For this assignment we key by client IP address for the HTTP API.
     """
 
-    def __init__(self, config: RateLimitConfig | None = None) -> None:
+    def __init__(
+        self,
+        config: RateLimitConfig | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self._config = config or RateLimitConfig()
+        self._clock = clock
         self._lock = RLock()
-        # key -> (window_start_epoch, count)
-        self._buckets: Dict[str, Tuple[float, int]] = {}
+        self._capacity = float(self._config.max_requests_per_window)
+        self._refill_per_second = (
+            self._capacity / self._config.window_seconds
+            if self._config.window_seconds > 0
+            else float("inf")
+        )
+        # key -> (tokens, last_refill)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _refill(self, tokens: float, last: float, now: float) -> float:
+        return min(self._capacity, tokens + (now - last) * self._refill_per_second)
+
+    def _seconds_until_full(self, tokens: float) -> float:
+        if self._refill_per_second <= 0:
+            return 0.0
+        return (self._capacity - tokens) / self._refill_per_second
 
     def allow_request(self, key: str) -> bool:
         """Return True if a request from `key` is allowed."""
-        now = time.time()
+        now = self._clock()
         with self._lock:
-            window_start, count = self._buckets.get(key, (now, 0))
-
-            # If the current window has expired, reset the bucket.
-            if now - window_start >= self._config.window_seconds:
-                window_start = now
-                count = 0
-
-            if count >= self._config.max_requests_per_window:
-                logger.warning(
-                    "Rate limit exceeded for key=%s (count=%d, window_start=%f)",
-                    key,
-                    count,
-                    window_start,
-                )
-                self._buckets[key] = (window_start, count)
-                app_metrics.record_rate_limit_hit(scope="ip")
-                # Update gauge with current maximum bucket usage across all keys.
-                try:
-                    max_count = max(c for _, c in self._buckets.values())
-                except ValueError:
-                    max_count = 0
-                if self._config.max_requests_per_window > 0:
-                    usage = max_count / float(self._config.max_requests_per_window)
-                    app_metrics.record_rate_limit_max_bucket_usage(
-                        scope="ip", usage_fraction=usage
-                    )
-                # Remaining time until this window resets for this key.
-                remaining = self._config.window_seconds - (now - window_start)
-                app_metrics.record_rate_limit_window_remaining(
-                    scope="ip", remaining_seconds=remaining
-                )
-                return False
-
-            # Record the successful request.
-            count += 1
-            self._buckets[key] = (window_start, count)
-            # Update gauge with current maximum bucket usage across all keys.
-            try:
-                max_count = max(c for _, c in self._buckets.values())
-            except ValueError:
-                max_count = 0
-            if self._config.max_requests_per_window > 0:
-                usage = max_count / float(self._config.max_requests_per_window)
-                app_metrics.record_rate_limit_max_bucket_usage(
-                    scope="ip", usage_fraction=usage
-                )
-            # Remaining time until this window resets for this key.
-            remaining = self._config.window_seconds - (now - window_start)
-            app_metrics.record_rate_limit_window_remaining(
-                scope="ip", remaining_seconds=remaining
+            bucket = self._buckets.get(key)
+            tokens = (
+                self._capacity
+                if bucket is None
+                else self._refill(bucket[0], bucket[1], now)
             )
-            return True
+            if tokens >= 1.0:
+                self._buckets[key] = (tokens - 1.0, now)
+                return True
+            self._buckets[key] = (tokens, now)
+
+        # Rejections also refresh the usage gauges for the key that hit the
+        # limit; the full cross-key view is left to the periodic
+        # ``sample_metrics`` so admitting a request never scans every bucket.
+        logger.warning(
+            "Rate limit exceeded for key=%s (tokens=%.2f)",
+            key,
+            tokens,
+        )
+        app_metrics.record_rate_limit_hit(scope="ip")
+        if self._capacity > 0:
+            app_metrics.record_rate_limit_max_bucket_usage(
+                scope="ip", usage_fraction=1.0 - tokens / self._capacity
+            )
+        app_metrics.record_rate_limit_window_remaining(
+            scope="ip", remaining_seconds=self._seconds_until_full(tokens)
+        )
+        return False
 
     def sample_metrics(self) -> None:
-        """Re-sample rate-limit usage/window metrics without a new request."""
-        now = time.time()
+        """Re-sample rate-limit usage/refill metrics without a new request."""
+        now = self._clock()
         with self._lock:
-            # Drop expired buckets so that usage decays after the window passes.
-            if self._buckets:
-                new_buckets: Dict[str, Tuple[float, int]] = {}
-                for key, (window_start, count) in self._buckets.items():
-                    if now - window_start < self._config.window_seconds:
-                        new_buckets[key] = (window_start, count)
-                self._buckets = new_buckets
-
-            if not self._buckets:
+            # Refill every bucket to `now` and drop the ones that are full
+            # again, so usage decays once a client goes quiet.
+            buckets: Dict[str, Tuple[float, float]] = {}
+            for key, (tokens, last) in self._buckets.items():
+                tokens = self._refill(tokens, last, now)
+                if tokens < self._capacity:
+                    buckets[key] = (tokens, now)
+            self._buckets = buckets
+
+            if not buckets:
                 # No active buckets: usage and remaining time are effectively 0.
                 app_metrics.record_rate_limit_max_bucket_usage(
                     scope="ip", usage_fraction=0.0
@@ -111,22 +113,13 @@ class RateLimiter:
                 )
                 return
 
-            max_count = max(count for _, count in self._buckets.values())
-            if self._config.max_requests_per_window > 0:
-                usage = max_count / float(self._config.max_requests_per_window)
-            else:
-                usage = 0.0
-
-            # Use the "worst case" remaining time across active keys.
-            remaining_candidates = [
-                self._config.window_seconds - (now - window_start)
-                for (window_start, _count) in self._buckets.values()
-            ]
-            remaining = max(remaining_candidates) if remaining_candidates else 0.0
+            min_tokens = min(tokens for tokens, _last in buckets.values())
 
-            app_metrics.record_rate_limit_max_bucket_usage(
-                scope="ip", usage_fraction=usage
-            )
-            app_metrics.record_rate_limit_window_remaining(
-                scope="ip", remaining_seconds=remaining
-            )
+        # The emptiest bucket is both the most used and the slowest to refill.
+        usage = 1.0 - min_tokens / self._capacity if self._capacity > 0 else 0.0
+        app_metrics.record_rate_limit_max_bucket_usage(
+            scope="ip", usage_fraction=usage
+        )
+        app_metrics.record_rate_limit_window_remaining(
+            scope="ip", remaining_seconds=self._seconds_until_full(min_tokens)
+        )
@@ -2,16 +2,16 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, Optional
 import base64
 
-from fastapi import WebSocket
 from starlette.websockets import WebSocketDisconnect
 
 from app.logging_utils import get_logger
 from app.models import AudioChunkMessage, EndOfStreamMessage, ErrorMessage
 from app.services import TTSService
 from app import metrics as app_metrics
+from app.ws_json import SupportsWebSocketSend, send_json_fast
 
 
 logger = get_logger(__name__)
@@ -22,17 +22,107 @@ class SessionWorkItem:
     """Work item for the streaming queue."""
 
     session_id: str
-    websocket: WebSocket
+    websocket: SupportsWebSocketSend
     future: asyncio.Future[None]
+    binary_audio: bool = True
 
 
 class SessionQueueFullError(RuntimeError):
     """Raised when the session queue is at capacity."""
 
 
+# Small provider chunks are coalesced into fewer, larger audio frames so a
+# stream costs O(bytes / batch) frame encodes and socket writes rather than one
+# per provider chunk. A batch is flushed once it reaches this size, or once
+# this long has passed since the previous flush.
+_AUDIO_BATCH_MAX_BYTES = 8 * 1024
+_AUDIO_BATCH_MAX_DELAY_S = 0.02
+
+
+async def _send_audio_stream(
+    websocket: SupportsWebSocketSend,
+    chunks: AsyncIterator[bytes],
+    *,
+    binary_audio: bool = True,
+    coalesce: bool = True,
+) -> None:
+    """Send encoded audio to the client as batched audio frames plus EOS.
+
+    Audio goes out as binary WebSocket frames holding the raw encoded bytes;
+    with ``binary_audio=False`` it is wrapped in legacy JSON "audio" messages
+    (base64 data plus a sequence number) instead. Control messages are JSON
+    either way.
+
+    The first chunk is always sent on its own to keep time-to-first-audio
+    unchanged. A partly filled batch is flushed by a timer once it is
+    ``_AUDIO_BATCH_MAX_DELAY_S`` old, without waiting for the next chunk, so
+    a slow provider never holds ready audio back. Streams whose chunks are
+    standalone files (``coalesce=False``) are sent one chunk per frame.
+    """
+    loop = asyncio.get_running_loop()
+    buf = bytearray()
+    seq = 1
+    last_flush = float("-inf")
+    stream = chunks.__aiter__()
+    # Pending anext() while a partial batch waits on its flush deadline; it is
+    # kept across timeouts because cancelling it would tear down the stream.
+    pending: Optional[asyncio.Future[Optional[bytes]]] = None
+
+    async def flush() -> None:
+        nonlocal seq, last_flush
+        if binary_audio:
+            await websocket.send_bytes(bytes(buf))
+        else:
+            b64 = base64.b64encode(buf).decode("ascii")
+            msg = AudioChunkMessage(type="audio", seq=seq, data=b64)
+            await send_json_fast(websocket, msg.model_dump())
+        buf.clear()
+        seq += 1
+        last_flush = loop.time()
+
+    try:
+        while True:
+            if not buf:
+                if pending is None:
+                    chunk = await anext(stream, None)
+                else:
+                    chunk, pending = await pending, None
+            else:
+                if pending is None:
+                    pending = asyncio.ensure_future(anext(stream, None))
+                remaining = last_flush + _AUDIO_BATCH_MAX_DELAY_S - loop.time()
+                done, _ = await asyncio.wait({pending}, timeout=max(0.0, remaining))
+                if not done:
+                    await flush()
+                    continue
+                chunk, pending = pending.result(), None
+            if chunk is None:
+                break
+            buf += chunk
+            if (
+                not coalesce
+                or len(buf) >= _AUDIO_BATCH_MAX_BYTES
+                or loop.time() - last_flush >= _AUDIO_BATCH_MAX_DELAY_S
+            ):
+                await flush()
+        if buf:
+            await flush()
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        # On a client disconnect, stop synthesis now instead of at GC time.
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    eos = EndOfStreamMessage(type="eos")
+    await send_json_fast(websocket, eos.model_dump())
+
+
 _queue: Optional[asyncio.Queue[SessionWorkItem]] = None
 _workers_started = False
 _workers_busy = 0
+_worker_tasks: list[asyncio.Task[None]] = []
 
 
 def configure_session_queue(
@@ -55,12 +145,13 @@ def configure_session_queue(
         return
 
     loop = asyncio.get_event_loop()
-    _queue = asyncio.Queue[SessionWorkItem](maxsize=maxsize)
+    # Workers and the admission path read the queue through a local binding
+    # rather than re-loading the module global on every use.
+    queue = _queue = asyncio.Queue[SessionWorkItem](maxsize=maxsize)
     app_metrics.TTS_SESSION_QUEUE_MAXSIZE.set(maxsize)
     app_metrics.TTS_SESSION_WORKERS_TOTAL.set(worker_count)
 
     async def worker(worker_id: int) -> None:
-        assert _queue is not None
         logger.info(
             "Session streaming worker %d starting (maxsize=%d)",
             worker_id,
@@ -68,22 +159,22 @@ def configure_session_queue(
         )
         global _workers_busy
         while True:
-            item = await _queue.get()
+            item = await queue.get()
             try:
                 _workers_busy += 1
                 app_metrics.TTS_SESSION_WORKERS_BUSY.set(_workers_busy)
-                app_metrics.TTS_SESSION_QUEUE_DEPTH.set(_queue.qsize())
+                app_metrics.TTS_SESSION_QUEUE_DEPTH.set(queue.qsize())
                 session_id = item.session_id
                 websocket = item.websocket
-                seq = 1
                 try:
-                    async for chunk in tts_service.stream_session_audio(session_id):
-                        b64 = base64.b64encode(chunk).decode("ascii")
-                        msg = AudioChunkMessage(type="audio", seq=seq, data=b64)
-                        await websocket.send_json(msg.model_dump())
-                        seq += 1
-                    eos = EndOfStreamMessage(type="eos")
-                    await websocket.send_json(eos.model_dump())
+                    await _send_audio_stream(
+                        websocket,
+                        tts_service.stream_session_audio(session_id),
+                        binary_audio=item.binary_audio,
+                        coalesce=not tts_service.session_chunks_are_self_contained(
+                            session_id
+                        ),
+                    )
                 except WebSocketDisconnect:
                     # Client disconnected; nothing special to do.
                     logger.info(
@@ -135,11 +226,11 @@ def configure_session_queue(
             finally:
                 _workers_busy -= 1
                 app_metrics.TTS_SESSION_WORKERS_BUSY.set(_workers_busy)
-                _queue.task_done()
-                app_metrics.TTS_SESSION_QUEUE_DEPTH.set(_queue.qsize())
+                queue.task_done()
+                app_metrics.TTS_SESSION_QUEUE_DEPTH.set(queue.qsize())
 
     for i in range(worker_count):
-        loop.create_task(worker(i + 1))
+        _worker_tasks.append(loop.create_task(worker(i + 1)))
     _workers_started = True
     logger.info(
         "Streaming queue configured with maxsize=%d, worker_count=%d",
@@ -148,18 +239,41 @@ def configure_session_queue(
     )
 
 
+async def shutdown_session_queue() -> None:
+    """Stop the worker tasks and forget the queue configured on this loop.
+
+    The queue and its workers belong to the event loop that ran
+    ``configure_session_queue``; once that loop shuts down they are unusable,
+    so the next ``configure_session_queue`` call must start from scratch.
+    """
+    global _queue, _workers_started
+
+    tasks = list(_worker_tasks)
+    _worker_tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _queue = None
+    _workers_started = False
+    logger.info("Streaming queue shut down (%d workers stopped)", len(tasks))
+
+
 async def enqueue_stream_request(
     session_id: str,
-    websocket: WebSocket,
+    websocket: SupportsWebSocketSend,
     tts_service: TTSService | None = None,
+    *,
+    binary_audio: bool = True,
 ) -> None:
     """Enqueue a streaming request and await completion.
 
     If the queue is not configured, falls back to streaming inline in the
     current task for simplicity. If the queue is full, raises
-    SessionQueueFullError.
+    SessionQueueFullError. ``binary_audio`` selects the audio frame encoding
+    (see ``_send_audio_stream``).
     """
-    if _queue is None:
+    queue = _queue
+    if queue is None:
         # Queue not configured; stream inline.
         logger.debug("Streaming queue not configured; streaming inline.")
         if tts_service is None:
@@ -168,15 +282,15 @@ async def enqueue_stream_request(
             )
 
             tts_service = get_tts_service()
-        seq = 1
         try:
-            async for chunk in tts_service.stream_session_audio(session_id):
-                b64 = base64.b64encode(chunk).decode("ascii")
-                msg = AudioChunkMessage(type="audio", seq=seq, data=b64)
-                await websocket.send_json(msg.model_dump())
-                seq += 1
-            eos = EndOfStreamMessage(type="eos")
-            await websocket.send_json(eos.model_dump())
+            await _send_audio_stream(
+                websocket,
+                tts_service.stream_session_audio(session_id),
+                binary_audio=binary_audio,
+                coalesce=not tts_service.session_chunks_are_self_contained(
+                    session_id
+                ),
+            )
         except WebSocketDisconnect:
             return
         except ValueError as exc:
@@ -208,17 +322,34 @@ async def enqueue_stream_request(
 
     loop = asyncio.get_running_loop()
     fut: asyncio.Future[None] = loop.create_future()
-    item = SessionWorkItem(session_id=session_id, websocket=websocket, future=fut)
+    item = SessionWorkItem(
+        session_id=session_id,
+        websocket=websocket,
+        future=fut,
+        binary_audio=binary_audio,
+    )
     try:
-        _queue.put_nowait(item)
+        queue.put_nowait(item)
     except asyncio.QueueFull as exc:
         logger.warning(
             "Session queue full (maxsize=%d) – rejecting new session.",
-            _queue.maxsize,
+            queue.maxsize,
         )
         app_metrics.TTS_SESSION_QUEUE_FULL_TOTAL.inc()
         raise SessionQueueFullError("session queue full") from exc
 
-    app_metrics.TTS_SESSION_QUEUE_DEPTH.set(_queue.qsize())
+    app_metrics.TTS_SESSION_QUEUE_DEPTH.set(queue.qsize())
 
     return await fut
+
+
+StreamEnqueuer = Callable[..., Awaitable[None]]
+
+
+def get_stream_enqueuer() -> StreamEnqueuer:
+    """FastAPI dependency returning the stream admission function.
+
+    Exposed as a dependency so tests can swap admission behaviour through
+    ``app.dependency_overrides`` instead of patching this module.
+    """
+    return enqueue_stream_request
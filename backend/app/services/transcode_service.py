@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor, ThreadPoolExecutor
 from enum import Enum
+from functools import partial
+from typing import Protocol
 
+import os
 import subprocess
 import asyncio
 
+from app.audio import wav_header
 from app.models import AudioFormat
 from app.providers import AudioChunk
 from app.logging_utils import get_logger
 
+try:  # Optional "resample" extra: in-process PCM16 sample-rate conversion.
+    import numpy as np
+    import soxr
+except ImportError:  # pragma: no cover - depends on installed extras
+    np = None  # type: ignore[assignment]
+    soxr = None  # type: ignore[assignment]
+
 
 logger = get_logger(__name__)
 
@@ -21,14 +33,223 @@ class SupportedAudioFormat(str, Enum):
     WAV = "wav"
 
 
+# ffmpeg muxer/demuxer name for each supported format, plus any encoder
+# options an output needs; the command builder is a table lookup per side.
+_FFMPEG_FORMATS: dict[SupportedAudioFormat, str] = {
+    SupportedAudioFormat.PCM16: "s16le",
+    SupportedAudioFormat.MULAW: "mulaw",
+    SupportedAudioFormat.OPUS: "opus",
+    SupportedAudioFormat.MP3: "mp3",
+    SupportedAudioFormat.WAV: "wav",
+}
+_FFMPEG_ENCODER_ARGS: dict[SupportedAudioFormat, tuple[str, ...]] = {
+    SupportedAudioFormat.MP3: ("-b:a", "128k"),
+    SupportedAudioFormat.OPUS: ("-b:a", "64k"),
+}
+
+
+def _supported_format(fmt: AudioFormat, direction: str) -> SupportedAudioFormat:
+    try:
+        return SupportedAudioFormat(fmt)
+    except ValueError as exc:  # invalid value for enum
+        raise ValueError(f"Unsupported {direction} format '{fmt}'") from exc
+
+
+# Output formats whose encodings form one continuous byte stream, so a whole
+# session can be fed through a single ffmpeg process. WAV is excluded: each
+# streamed WAV chunk carries its own header.
+_STREAMABLE_OUTPUT_FORMATS = frozenset(
+    {
+        SupportedAudioFormat.PCM16,
+        SupportedAudioFormat.MULAW,
+        SupportedAudioFormat.MP3,
+        SupportedAudioFormat.OPUS,
+    }
+)
+
+# How long the first ``feed`` waits for ffmpeg's first output, so that
+# time-to-first-audio is not pushed back by a whole provider chunk.
+_FIRST_OUTPUT_GRACE_S = 0.05
+
+
+class StreamTranscoder(Protocol):
+    """Incremental encoder for one audio stream (see ``open_stream``)."""
+
+    async def feed(self, data: bytes) -> bytes:
+        ...
+
+    async def finish(self) -> bytes:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+def _pcm16_samples(data: bytes, channels: int):
+    samples = np.frombuffer(data, dtype=np.int16)
+    return samples.reshape(-1, channels) if channels > 1 else samples
+
+
+class ResampleStream:
+    """In-process PCM16 resampler for one stream, backed by soxr.
+
+    Keeps the filter state across chunks, so chunk boundaries do not click
+    the way independently resampled chunks would. HQ resampling is CPU-bound,
+    so each step runs on ``executor`` rather than on the event loop; feeds are
+    awaited one at a time, so the filter state is never shared between threads.
+    """
+
+    def __init__(
+        self, in_rate: int, out_rate: int, channels: int, executor: Executor
+    ) -> None:
+        self._channels = channels
+        self._executor = executor
+        self._resampler = soxr.ResampleStream(
+            in_rate, out_rate, channels, dtype="int16", quality="HQ"
+        )
+
+    def _resample(self, data: bytes, last: bool) -> bytes:
+        samples = _pcm16_samples(data, self._channels)
+        return self._resampler.resample_chunk(samples, last=last).tobytes()
+
+    async def feed(self, data: bytes) -> bytes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._resample, data, False
+        )
+
+    async def finish(self) -> bytes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._resample, b"", True
+        )
+
+    async def aclose(self) -> None:
+        return None
+
+
+class TranscodeStream:
+    """Incremental transcoder backed by one long-running ffmpeg process.
+
+    Input chunks are written to ffmpeg's stdin as they arrive, and each
+    ``feed`` returns whatever encoded output ffmpeg has produced so far, so a
+    single process start is amortised over the whole stream. Output may lag
+    input slightly; ``finish`` flushes the remainder. Always ``aclose`` the
+    stream, which kills ffmpeg if it is still running.
+    """
+
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self._proc = proc
+        # Output reads are kept as separate parts and joined on demand: the
+        # common case is one read per feed, which b"".join returns uncopied.
+        self._out: list[bytes] = []
+        self._has_output = asyncio.Event()
+        self._seen_output = False
+        self._stdout_task = asyncio.ensure_future(self._drain_stdout())
+        self._stderr_task = asyncio.ensure_future(self._read_stderr())
+
+    async def _drain_stdout(self) -> None:
+        assert self._proc.stdout is not None
+        while True:
+            data = await self._proc.stdout.read(65536)
+            if not data:
+                return
+            self._out.append(data)
+            self._has_output.set()
+
+    async def _read_stderr(self) -> bytes:
+        assert self._proc.stderr is not None
+        return await self._proc.stderr.read()
+
+    def _take_output(self) -> bytes:
+        out = b"".join(self._out)
+        self._out.clear()
+        self._has_output.clear()
+        return out
+
+    async def _failure(self) -> ValueError:
+        await self._proc.wait()
+        stderr = await self._stderr_task
+        message = stderr.decode("utf-8", errors="ignore") or str(
+            self._proc.returncode
+        )
+        logger.error("ffmpeg stream failed: %s", message)
+        return ValueError(f"ffmpeg transcoding failed: {message}")
+
+    async def feed(self, data: bytes) -> bytes:
+        """Write one chunk of input and return the output available so far."""
+        stdin = self._proc.stdin
+        assert stdin is not None
+        if self._proc.returncode is not None:
+            raise await self._failure()
+        try:
+            stdin.write(data)
+            await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            raise await self._failure() from None
+
+        if not self._seen_output:
+            try:
+                await asyncio.wait_for(
+                    self._has_output.wait(), timeout=_FIRST_OUTPUT_GRACE_S
+                )
+            except asyncio.TimeoutError:
+                pass
+        out = self._take_output()
+        if out:
+            self._seen_output = True
+        return out
+
+    async def finish(self) -> bytes:
+        """Close ffmpeg's input and return all remaining output."""
+        stdin = self._proc.stdin
+        assert stdin is not None
+        stdin.close()
+        await self._stdout_task
+        if await self._proc.wait() != 0:
+            raise await self._failure()
+        return self._take_output()
+
+    async def aclose(self) -> None:
+        """Release the ffmpeg process, killing it if it is still running."""
+        if self._proc.returncode is None:
+            self._proc.kill()
+            await self._proc.wait()
+        for task in (self._stdout_task, self._stderr_task):
+            if not task.done():
+                task.cancel()
+
+
 class AudioTranscodeService:
     """General-purpose audio transcoder using ffmpeg CLI.
 
     This service accepts AudioChunk objects in any supported input
     format and transcodes them on the fly into the requested output
     format and sample rate.
+
+    Encoding runs on a dedicated thread pool (one worker per CPU by default)
+    so concurrent streams encode in parallel without blocking the event loop
+    or competing with other users of the default executor.
     """
 
+    def __init__(self, max_workers: int | None = None) -> None:
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._encoder_pool: ThreadPoolExecutor | None = None
+
+    def _get_encoder_pool(self) -> ThreadPoolExecutor:
+        if self._encoder_pool is None:
+            self._encoder_pool = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="transcode",
+            )
+        return self._encoder_pool
+
+    def close(self) -> None:
+        """Shut down the encoder thread pool; it is recreated on next use."""
+        pool, self._encoder_pool = self._encoder_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     async def transcode_chunk(
         self,
         chunk: AudioChunk,
@@ -36,6 +257,15 @@ class AudioTranscodeService:
         target_format: AudioFormat,
         sample_rate_hz: int,
     ) -> bytes:
+        # Fast path: already in the requested format and sample rate. This is
+        # the common case for providers that emit the wire format, so it runs
+        # before any logging; the identity check settles enum members without
+        # falling through to str comparison.
+        if (
+            chunk.format is target_format or chunk.format == target_format
+        ) and chunk.sample_rate_hz == sample_rate_hz:
+            return chunk.data
+
         logger.info(
             "[START] transcode_chunk in=%s@%dHz ch=%d -> out=%s@%dHz (len=%d)",
             chunk.format,
@@ -46,103 +276,191 @@ class AudioTranscodeService:
             len(chunk.data),
         )
 
-        # Fast path: already in the requested format and sample rate.
-        if chunk.format == target_format and chunk.sample_rate_hz == sample_rate_hz:
-            logger.info("[SKIP] transcoding not required (format/rate match)")
-            return chunk.data
+        # PCM16 -> WAV only needs a header in front of the samples.
+        if chunk.format == AudioFormat.PCM16 and target_format == AudioFormat.WAV:
+            if chunk.sample_rate_hz == sample_rate_hz:
+                num_samples = len(chunk.data) // (2 * chunk.num_channels)
+                return (
+                    wav_header(num_samples, sample_rate_hz, chunk.num_channels)
+                    + chunk.data
+                )
+            if self._can_resample_in_process(chunk.format, AudioFormat.PCM16):
+                pcm = await self._resample_on_pool(chunk, sample_rate_hz)
+                num_samples = len(pcm) // (2 * chunk.num_channels)
+                return (
+                    wav_header(num_samples, sample_rate_hz, chunk.num_channels)
+                    + pcm
+                )
+
+        # PCM16 rate changes are resampled in-process when soxr is installed.
+        if self._can_resample_in_process(chunk.format, target_format):
+            return await self._resample_on_pool(chunk, sample_rate_hz)
+
+        # Route all other cases through ffmpeg CLI on the encoder pool.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_encoder_pool(),
+            partial(
+                self._ffmpeg_transcode,
+                data=chunk.data,
+                in_format=chunk.format,
+                in_rate=chunk.sample_rate_hz,
+                in_channels=chunk.num_channels,
+                out_format=target_format,
+                out_rate=sample_rate_hz,
+            ),
+        )
+
+    @staticmethod
+    def _can_resample_in_process(
+        in_format: AudioFormat, out_format: AudioFormat
+    ) -> bool:
+        return (
+            soxr is not None
+            and in_format == AudioFormat.PCM16
+            and out_format == AudioFormat.PCM16
+        )
+
+    async def _resample_on_pool(self, chunk: AudioChunk, out_rate: int) -> bytes:
+        # HQ resampling is CPU-bound; keep it off the event loop like ffmpeg.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_encoder_pool(),
+            partial(
+                self._soxr_resample,
+                chunk.data,
+                in_rate=chunk.sample_rate_hz,
+                out_rate=out_rate,
+                channels=chunk.num_channels,
+            ),
+        )
+
+    @staticmethod
+    def _soxr_resample(
+        data: bytes, *, in_rate: int, out_rate: int, channels: int
+    ) -> bytes:
+        samples = _pcm16_samples(data, channels)
+        return soxr.resample(samples, in_rate, out_rate, quality="HQ").tobytes()
+
+    def supports_stream(self, target_format: AudioFormat) -> bool:
+        """Return True if ``open_stream`` can encode to ``target_format``."""
+        try:
+            return SupportedAudioFormat(target_format) in _STREAMABLE_OUTPUT_FORMATS
+        except ValueError:
+            return False
+
+    async def open_stream(
+        self,
+        first_chunk: AudioChunk,
+        *,
+        target_format: AudioFormat,
+        sample_rate_hz: int,
+    ) -> StreamTranscoder:
+        """Start one encoder for a stream shaped like ``first_chunk``.
 
-        # Route all other cases through ffmpeg CLI.
-        return await asyncio.to_thread(
-            self._ffmpeg_transcode,
-            data=chunk.data,
-            in_format=chunk.format,
-            in_rate=chunk.sample_rate_hz,
-            in_channels=chunk.num_channels,
+        Later chunks fed to the returned stream must share the first chunk's
+        format, sample rate and channel count. PCM16 rate changes use an
+        in-process soxr resampler when available; everything else runs
+        through a single ffmpeg process.
+        """
+        if self._can_resample_in_process(first_chunk.format, target_format):
+            return ResampleStream(
+                first_chunk.sample_rate_hz,
+                sample_rate_hz,
+                first_chunk.num_channels,
+                self._get_encoder_pool(),
+            )
+        cmd = self._ffmpeg_cmd(
+            in_format=first_chunk.format,
+            in_rate=first_chunk.sample_rate_hz,
+            in_channels=first_chunk.num_channels,
             out_format=target_format,
             out_rate=sample_rate_hz,
+            # Without a tiny probe size ffmpeg holds input back until it has
+            # probed a large prefix, and without flush_packets it buffers
+            # output; either way nothing would come out before ``finish``.
+            extra_input_args=("-probesize", "32"),
+            extra_output_args=("-flush_packets", "1"),
         )
+        logger.info("[FFMPEG] stream cmd=%s", " ".join(cmd))
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as exc:
+            logger.error("ffmpeg execution failed: %s", exc, exc_info=True)
+            raise ValueError(f"ffmpeg execution failed: {exc}") from exc
+        return TranscodeStream(proc)
 
-    def _ffmpeg_transcode(
+    def _ffmpeg_cmd(
         self,
         *,
-        data: bytes,
         in_format: AudioFormat,
         in_rate: int,
         in_channels: int,
         out_format: AudioFormat,
         out_rate: int,
-    ) -> bytes:
-        """Invoke ffmpeg CLI to convert between formats and sample rates."""
+        extra_input_args: tuple[str, ...] = (),
+        extra_output_args: tuple[str, ...] = (),
+    ) -> list[str]:
+        """Build the ffmpeg command line for a pipe-to-pipe conversion."""
+        in_enum = _supported_format(in_format, "input")
+        out_enum = _supported_format(out_format, "output")
+        in_args = (
+            "-f",
+            _FFMPEG_FORMATS[in_enum],
+            "-ar",
+            str(in_rate),
+            "-ac",
+            str(in_channels),
+        )
+        out_args = (
+            "-f",
+            _FFMPEG_FORMATS[out_enum],
+            "-ar",
+            str(out_rate),
+            "-ac",
+            str(in_channels),
+            *_FFMPEG_ENCODER_ARGS.get(out_enum, ()),
+        )
 
-        def input_args(fmt: AudioFormat) -> list[str]:
-            try:
-                fmt_enum = SupportedAudioFormat(fmt)
-            except ValueError as exc:  # invalid value for enum
-                raise ValueError(f"Unsupported input format '{fmt}'") from exc
-
-            if fmt_enum is SupportedAudioFormat.PCM16:
-                return ["-f", "s16le", "-ar", str(in_rate), "-ac", str(in_channels)]
-            if fmt_enum is SupportedAudioFormat.WAV:
-                return ["-f", "wav", "-ar", str(in_rate), "-ac", str(in_channels)]
-            if fmt_enum is SupportedAudioFormat.MP3:
-                return ["-f", "mp3", "-ar", str(in_rate), "-ac", str(in_channels)]
-            if fmt_enum is SupportedAudioFormat.MULAW:
-                return ["-f", "mulaw", "-ar", str(in_rate), "-ac", str(in_channels)]
-            if fmt_enum is SupportedAudioFormat.OPUS:
-                return ["-f", "opus", "-ar", str(in_rate), "-ac", str(in_channels)]
-            raise ValueError(f"Unsupported input format '{fmt}'")
-
-        def output_args(fmt: AudioFormat) -> list[str]:
-            try:
-                fmt_enum = SupportedAudioFormat(fmt)
-            except ValueError as exc:
-                raise ValueError(f"Unsupported output format '{fmt}'") from exc
-
-            if fmt_enum is SupportedAudioFormat.PCM16:
-                return ["-f", "s16le", "-ar", str(out_rate), "-ac", str(in_channels)]
-            if fmt_enum is SupportedAudioFormat.WAV:
-                return ["-f", "wav", "-ar", str(out_rate), "-ac", str(in_channels)]
-            if fmt_enum is SupportedAudioFormat.MP3:
-                return [
-                    "-f",
-                    "mp3",
-                    "-ar",
-                    str(out_rate),
-                    "-ac",
-                    str(in_channels),
-                    "-b:a",
-                    "128k",
-                ]
-            if fmt_enum is SupportedAudioFormat.OPUS:
-                return [
-                    "-f",
-                    "opus",
-                    "-ar",
-                    str(out_rate),
-                    "-ac",
-                    str(in_channels),
-                    "-b:a",
-                    "64k",
-                ]
-            if fmt_enum is SupportedAudioFormat.MULAW:
-                return ["-f", "mulaw", "-ar", str(out_rate), "-ac", str(in_channels)]
-            raise ValueError(f"Unsupported output format '{fmt}'")
-
-        in_args = input_args(in_format)
-        out_args = output_args(out_format)
-
-        cmd = [
+        return [
             "ffmpeg",
             "-hide_banner",
             "-loglevel",
             "error",
             *in_args,
+            *extra_input_args,
             "-i",
             "pipe:0",
             *out_args,
+            *extra_output_args,
             "pipe:1",
         ]
 
+    def _ffmpeg_transcode(
+        self,
+        *,
+        data: bytes,
+        in_format: AudioFormat,
+        in_rate: int,
+        in_channels: int,
+        out_format: AudioFormat,
+        out_rate: int,
+    ) -> bytes:
+        """Invoke ffmpeg CLI to convert between formats and sample rates."""
+
+        cmd = self._ffmpeg_cmd(
+            in_format=in_format,
+            in_rate=in_rate,
+            in_channels=in_channels,
+            out_format=out_format,
+            out_rate=out_rate,
+        )
+
         logger.info(
             "[FFMPEG] cmd=%s (input_len=%d)",
             " ".join(cmd),
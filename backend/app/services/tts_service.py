@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import asyncio
-from typing import AsyncIterator
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque
 from uuid import uuid4
-from builtins import anext
 
 from app.models import (
     CreateTTSSessionRequest,
@@ -11,13 +12,145 @@ from app.models import (
     SessionStatus,
     AudioFormat,
 )
-from app.providers import ProviderRegistry
+from app.providers import AudioChunk, ProviderRegistry, ProviderRetriableError
 from app.repositories import TTSSessionRepository
 from app import metrics as app_metrics
-from .transcode_service import AudioTranscodeService
+from .transcode_service import AudioTranscodeService, StreamTranscoder
 from .circuit_breaker import CircuitBreakerRegistry
 
 
+# Provider errors that are worth retrying with a fresh stream; anything else
+# propagates straight to the caller.
+_RETRIABLE_PROVIDER_ERRORS = (asyncio.TimeoutError, ProviderRetriableError)
+
+# Returned by anext() when a provider stream is exhausted, so normal stream
+# completion does not go through StopAsyncIteration.
+_END_OF_STREAM = object()
+
+# Returned by _await_first_chunk when the warm-up deadline runs out, so a
+# retried attempt is a plain comparison rather than a raised TimeoutError.
+_FIRST_CHUNK_TIMED_OUT = object()
+
+# ``asyncio.timeout`` (3.11+) arms a timer on the current task instead of
+# wrapping each awaited step in a new Task the way ``wait_for`` does.
+_asyncio_timeout = getattr(asyncio, "timeout", None)
+
+
+# How many provider chunks may be synthesised ahead of the encoder.
+_READ_AHEAD_DEPTH = 2
+
+
+class _ReadAheadError:
+    """Carries a producer-side exception across the read-ahead queue."""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+async def _read_ahead(
+    chunks: AsyncIterator[AudioChunk], depth: int = _READ_AHEAD_DEPTH
+) -> AsyncIterator[AudioChunk]:
+    """Iterate ``chunks`` from a background task, up to ``depth`` items ahead.
+
+    This lets the provider synthesise the next chunk while the caller is still
+    encoding the current one. Order is preserved and provider exceptions are
+    re-raised in the caller at the point they occurred in the stream.
+    """
+    queue: asyncio.Queue[object] = asyncio.Queue(maxsize=depth)
+
+    async def produce() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception as exc:
+            await queue.put(_ReadAheadError(exc))
+        else:
+            await queue.put(_END_OF_STREAM)
+        finally:
+            # Close the provider stream here, in the task that iterated it,
+            # including when the consumer stops early and cancels us.
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, _ReadAheadError):
+                raise item.exc
+            yield item  # type: ignore[misc]
+    finally:
+        # On 3.10 a wait_for() inside the producer can swallow a cancel that
+        # races with its inner future completing, so keep cancelling until
+        # the task actually finishes rather than awaiting it once.
+        while not producer.done():
+            producer.cancel()
+            await asyncio.wait({producer}, timeout=0.05)
+        if not producer.cancelled():
+            producer.exception()  # mark any late error as retrieved
+
+
+def _record_session_created(session: TTSSession) -> None:
+    app_metrics.record_session_created(session.provider)
+
+
+@dataclass
+class _StreamContext:
+    """Per-stream invariants resolved once before the chunk loop.
+
+    Instances are pooled on TTSService and rebound for each new stream, so
+    concurrent sessions do not allocate fresh state objects every time.
+    """
+
+    provider_id: str = ""
+    target_format: AudioFormat | None = None
+    sample_rate_hz: int = 0
+    needs_transcode: bool = True
+    # Encode through one stream transcoder for the whole session rather than
+    # one conversion per chunk; ``transcoder`` is opened lazily.
+    use_transcode_stream: bool = False
+    transcoder: StreamTranscoder | None = None
+    chunks_total: Any = None
+    bytes_total: Any = None
+
+    def bind(
+        self,
+        session: TTSSession,
+        provider: Any,
+        *,
+        transcode_streamable: bool,
+    ) -> None:
+        self.provider_id = session.provider
+        self.target_format = session.target_format
+        self.sample_rate_hz = session.sample_rate_hz
+        # Decide once per stream whether chunks need re-encoding at all; when
+        # the provider already emits the requested format/rate we forward
+        # its bytes untouched.
+        self.needs_transcode = (session.target_format, session.sample_rate_hz) != (
+            getattr(provider, "native_format", None),
+            getattr(provider, "native_sample_rate_hz", None),
+        )
+        self.use_transcode_stream = self.needs_transcode and transcode_streamable
+        self.chunks_total, self.bytes_total = app_metrics.stream_chunk_counters(
+            session.provider, session.target_format
+        )
+
+    def reset(self) -> None:
+        self.provider_id = ""
+        self.target_format = None
+        self.sample_rate_hz = 0
+        self.needs_transcode = True
+        self.use_transcode_stream = False
+        self.transcoder = None
+        self.chunks_total = None
+        self.bytes_total = None
+
+
 class TTSService:
     """Orchestrates provider streaming and session lifecycle."""
 
@@ -30,6 +163,7 @@ class TTSService:
         circuit_breakers: CircuitBreakerRegistry,
         provider_timeout_seconds: float = 10.0,
         provider_max_retries: int = 2,
+        provider_warmup_extensions: int = 1,
     ) -> None:
         self._providers = provider_registry
         self._sessions = session_repo
@@ -37,12 +171,17 @@ class TTSService:
         self._circuit_breakers = circuit_breakers
         self._provider_timeout_seconds = provider_timeout_seconds
         self._provider_max_retries = max(1, provider_max_retries)
+        self._provider_warmup_extensions = max(0, provider_warmup_extensions)
+        self._ctx_pool: Deque[_StreamContext] = deque()
 
     def create_session(self, req: CreateTTSSessionRequest) -> TTSSession:
-        """Create and persist a new TTS session."""
-        session_id = str(uuid4())
+        """Create and persist a new TTS session.
+
+        The in-memory repository never blocks, so this stays synchronous; the
+        created-session metric is recorded by the repository's save hook.
+        """
         session = TTSSession.new(
-            id=session_id,
+            id=str(uuid4()),
             provider=req.provider,
             voice=req.voice,
             text=req.text,
@@ -50,15 +189,28 @@ class TTSService:
             target_format=req.target_format,
             sample_rate_hz=req.sample_rate_hz,
         )
-        self._sessions.save(session)
-        app_metrics.record_session_created(req.provider)
+        self._sessions.save(session, on_saved=_record_session_created)
         return session
 
-    async def stream_session_audio(
+    def session_chunks_are_self_contained(self, session_id: str) -> bool:
+        """Return True if each streamed chunk of the session is a whole file.
+
+        Per-chunk WAV output carries its own RIFF header, so those chunks
+        must reach the client one per frame rather than concatenated.
+        """
+        session = self._sessions.get(session_id)
+        return session is not None and session.target_format == AudioFormat.WAV
+
+    def stream_session_audio(
         self,
         session_id: str,
     ) -> AsyncIterator[bytes]:
-        """Yield encoded audio chunks for a given session."""
+        """Return an iterator of encoded audio chunks for a given session.
+
+        The session and circuit-breaker checks run eagerly, so an unknown
+        session or an open circuit raises ``ValueError`` from this call
+        rather than from the first iteration step.
+        """
         session = self._sessions.get(session_id)
         if not session:
             raise ValueError(f"Unknown session '{session_id}'")
@@ -72,35 +224,50 @@ class TTSService:
             )
 
         provider = self._providers.get(provider_id)
+        return self._stream_session_audio(session, provider)
+
+    async def _stream_session_audio(
+        self,
+        session: TTSSession,
+        provider,
+    ) -> AsyncIterator[bytes]:
+        provider_id = session.provider
+        ctx = self._ctx_pool.pop() if self._ctx_pool else _StreamContext()
+        ctx.bind(
+            session,
+            provider,
+            transcode_streamable=self._transcode.supports_stream(
+                session.target_format
+            ),
+        )
         self._sessions.update_status(session.id, SessionStatus.STREAMING)
         app_metrics.increment_active_streams(provider_id)
 
+        chunks = self._stream_from_provider_with_retry(
+            provider_id=provider_id,
+            provider=provider,
+            text=session.text,
+            voice_id=session.voice,
+            language=session.language,
+        )
+        if ctx.needs_transcode:
+            # Encoding awaits (ffmpeg, executor), so let the provider keep
+            # synthesising meanwhile; pass-through streams gain nothing from it.
+            chunks = _read_ahead(chunks)
+
         try:
-            async for chunk in self._stream_from_provider_with_retry(
-                provider_id=provider_id,
-                provider=provider,
-                text=session.text,
-                voice_id=session.voice,
-                language=session.language,
-            ):
-                try:
-                    encoded = await self._transcode.transcode_chunk(
-                        chunk,
-                        target_format=session.target_format,
-                        sample_rate_hz=session.sample_rate_hz,
-                    )
-                except ValueError:
-                    # Treat per-chunk transcoding failures as skippable: drop this
-                    # chunk, record a metric, and continue with subsequent audio.
-                    app_metrics.record_stream_chunk_dropped(
-                        provider_id,
-                        session.target_format,
-                        reason="transcode_error",
-                    )
+            async for chunk in chunks:
+                encoded = await self._encode_chunk(ctx, chunk)
+                if not encoded:
                     continue
-                app_metrics.record_stream_chunk(
-                    provider_id, session.target_format, len(encoded)
-                )
+                ctx.chunks_total.inc()
+                ctx.bytes_total.inc(len(encoded))
+                yield encoded
+            # Flush whatever the stream transcoder is still holding.
+            encoded = await self._finish_encoding(ctx)
+            if encoded:
+                ctx.chunks_total.inc()
+                ctx.bytes_total.inc(len(encoded))
                 yield encoded
         except Exception:
             self._sessions.update_status(session.id, SessionStatus.FAILED)
@@ -108,14 +275,82 @@ class TTSService:
             self._circuit_breakers.record_failure(provider_id)
             app_metrics.record_session_failed(provider_id)
             app_metrics.record_provider_failure(provider_id)
-            app_metrics.decrement_active_streams(provider_id)
             raise
         else:
             # Successful completion resets breaker state.
             self._circuit_breakers.record_success(provider_id)
             self._sessions.update_status(session.id, SessionStatus.COMPLETED)
             app_metrics.record_session_completed(provider_id)
+        finally:
+            # Also runs when the consumer stops early (aclose/GeneratorExit):
+            # stop the read-ahead producer and the provider stream before the
+            # context goes back to the pool.
             app_metrics.decrement_active_streams(provider_id)
+            try:
+                await chunks.aclose()
+            finally:
+                if ctx.transcoder is not None:
+                    await ctx.transcoder.aclose()
+                ctx.reset()
+                self._ctx_pool.append(ctx)
+
+    async def _encode_chunk(self, ctx: _StreamContext, chunk: AudioChunk) -> bytes:
+        """Encode one provider chunk; empty bytes mean nothing to send yet."""
+        if not ctx.needs_transcode or (
+            ctx.transcoder is None
+            and chunk.format == ctx.target_format
+            and chunk.sample_rate_hz == ctx.sample_rate_hz
+        ):
+            # Providers that do not declare a native format are only known to
+            # match the target once their chunks arrive.
+            return chunk.data
+        try:
+            if not ctx.use_transcode_stream:
+                return await self._transcode.transcode_chunk(
+                    chunk,
+                    target_format=ctx.target_format,
+                    sample_rate_hz=ctx.sample_rate_hz,
+                )
+            if ctx.transcoder is None:
+                ctx.transcoder = await self._transcode.open_stream(
+                    chunk,
+                    target_format=ctx.target_format,
+                    sample_rate_hz=ctx.sample_rate_hz,
+                )
+            return await ctx.transcoder.feed(chunk.data)
+        except ValueError:
+            # Treat transcoding failures as skippable: drop this chunk, record
+            # a metric, and continue with subsequent audio. A broken stream
+            # transcoder falls back to per-chunk encoding for the rest.
+            app_metrics.record_stream_chunk_dropped(
+                ctx.provider_id,
+                ctx.target_format,
+                reason="transcode_error",
+            )
+            await self._drop_transcoder(ctx)
+            return b""
+
+    async def _finish_encoding(self, ctx: _StreamContext) -> bytes:
+        if ctx.transcoder is None:
+            return b""
+        try:
+            return await ctx.transcoder.finish()
+        except ValueError:
+            app_metrics.record_stream_chunk_dropped(
+                ctx.provider_id,
+                ctx.target_format,
+                reason="transcode_error",
+            )
+            return b""
+        finally:
+            await self._drop_transcoder(ctx)
+
+    @staticmethod
+    async def _drop_transcoder(ctx: _StreamContext) -> None:
+        transcoder, ctx.transcoder = ctx.transcoder, None
+        ctx.use_transcode_stream = False
+        if transcoder is not None:
+            await transcoder.aclose()
 
     async def _stream_from_provider_with_retry(
         self,
@@ -125,18 +360,19 @@ class TTSService:
         text: str,
         voice_id: str,
         language: str | None,
-    ) -> AsyncIterator["AudioChunk"]:
+    ) -> AsyncIterator[AudioChunk]:
         """Stream audio from provider with timeout and simple retry logic.
 
-        If the provider fails or times out before yielding any audio, we will
-        retry up to ``provider_max_retries`` times. Once audio has started
+        If the provider times out or raises ``ProviderRetriableError`` before
+        yielding any audio, we will retry up to ``provider_max_retries`` times;
+        other provider errors propagate immediately. Once audio has started
         flowing, any subsequent error ends the stream without retry to avoid
         duplicated audio.
-        """
 
-        from app.providers import AudioChunk  # local import to avoid cycle
-
-        last_error: Exception | None = None
+        A slow *first* chunk is usually model warm-up rather than a hard
+        failure, so it gets an extended deadline on the same generator (see
+        ``_await_first_chunk``) before we fall back to restarting it.
+        """
         for attempt in range(1, self._provider_max_retries + 1):
             had_output = False
             stream = provider.stream_synthesize(
@@ -145,20 +381,64 @@ class TTSService:
                 language=language,
             )
             try:
-                while True:
-                    try:
-                        chunk: AudioChunk = await asyncio.wait_for(
-                            anext(stream),  # instead of stream.__anext__()
-                            timeout=self._provider_timeout_seconds,
-                        )
-                    except StopAsyncIteration:
-                        return
+                chunk = await self._await_first_chunk(stream)
+                if chunk is _FIRST_CHUNK_TIMED_OUT:
+                    if attempt == self._provider_max_retries:
+                        raise asyncio.TimeoutError()
+                    continue
+                while chunk is not _END_OF_STREAM:
                     had_output = True
                     yield chunk
-            except (asyncio.TimeoutError, Exception) as exc:  # noqa: BLE001
-                last_error = exc
+                    chunk = await self._await_next_chunk(stream)
+                return
+            except _RETRIABLE_PROVIDER_ERRORS:
                 # If we already produced audio, do not retry to avoid duplicates.
                 if had_output or attempt == self._provider_max_retries:
                     raise
                 # Otherwise, fall through to next attempt in the loop.
                 continue
+            finally:
+                # Close each attempt's provider stream now, including when our
+                # consumer stops early, rather than leaving it to the GC.
+                aclose = getattr(stream, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+    async def _await_next_chunk(self, stream: AsyncIterator[AudioChunk]) -> object:
+        """Wait for a subsequent chunk, bounded by ``provider_timeout_seconds``.
+
+        The deadline only covers the provider step itself, never the time the
+        consumer spends with a chunk we have already yielded.
+        """
+        if _asyncio_timeout is None:
+            return await asyncio.wait_for(
+                anext(stream, _END_OF_STREAM),
+                timeout=self._provider_timeout_seconds,
+            )
+        async with _asyncio_timeout(self._provider_timeout_seconds):
+            return await anext(stream, _END_OF_STREAM)
+
+    async def _await_first_chunk(self, stream: AsyncIterator[AudioChunk]) -> object:
+        """Wait for a provider's first chunk without discarding warm-up work.
+
+        ``asyncio.wait_for`` would cancel the pending ``anext`` on timeout and
+        tear down the generator along with any model state it has built. We
+        instead keep waiting on the same pending step for up to
+        ``provider_warmup_extensions`` further windows of
+        ``provider_timeout_seconds`` each, and only return
+        ``_FIRST_CHUNK_TIMED_OUT`` once those extensions are exhausted. Returns
+        ``_END_OF_STREAM`` if the provider produced nothing at all.
+        """
+        pending = asyncio.ensure_future(anext(stream, _END_OF_STREAM))
+        timeout = self._provider_timeout_seconds
+        try:
+            for _ in range(self._provider_warmup_extensions + 1):
+                done, _pending = await asyncio.wait({pending}, timeout=timeout)
+                if done:
+                    return pending.result()
+            return _FIRST_CHUNK_TIMED_OUT
+        finally:
+            if not pending.done():
+                pending.cancel()
+                # Let the cancellation land so the stream can be closed next.
+                await asyncio.gather(pending, return_exceptions=True)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from typing import Callable
 
 from .engines.base import BaseTTSEngine
@@ -16,13 +17,22 @@ def get_engine_name() -> str:
     return os.getenv("TTS_ENGINE", "dummy").lower()
 
 
-def get_engine() -> BaseTTSEngine:
-    name = get_engine_name()
+@lru_cache(maxsize=8)
+def _build_engine(name: str) -> BaseTTSEngine:
     if name not in _ENGINE_FACTORIES:
         raise ValueError(f"Unknown TTS_ENGINE '{name}'")
     return _ENGINE_FACTORIES[name]()
 
 
+def get_engine() -> BaseTTSEngine:
+    """Return the engine selected by TTS_ENGINE, built once per process.
+
+    Engines may load model weights, so instances are cached per engine name;
+    tests that swap engines can call `_build_engine.cache_clear()`.
+    """
+    return _build_engine(get_engine_name())
+
+
 def list_voices() -> list[dict]:
     return get_engine().voices()
 
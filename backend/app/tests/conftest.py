@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import functools
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI
+
+from app.main import create_app
+
+
+@functools.lru_cache(maxsize=1)
+def _test_app() -> FastAPI:
+    """Build the FastAPI app once per test process.
+
+    Per-test behaviour is swapped in through ``dependency_overrides``, which
+    are cleared after every test, so there is no need to rebuild routes and
+    middleware for isolation.
+    """
+    return create_app()
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """Single FastAPI app shared across the test suite."""
+    return _test_app()
+
+
+@pytest.fixture(autouse=True)
+def _clear_dependency_overrides() -> Iterator[None]:
+    """Reset per-test dependency overrides on the shared app."""
+    yield
+    # Only touch the app if some test actually built it; unit tests never do.
+    if _test_app.cache_info().currsize:
+        _test_app().dependency_overrides.clear()
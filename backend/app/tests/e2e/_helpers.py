@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from fastapi.testclient import TestClient
+
+
+def create_sessions(
+    client: TestClient,
+    *,
+    provider: str,
+    texts: List[str],
+    target_format: str,
+    sample_rate_hz: int,
+    voice: str,
+    language: str,
+) -> List[str]:
+    """Create one session per utterance up front, before any streaming."""
+    # Everything but the text is shared by the utterances; build it once.
+    base_payload = {
+        "provider": provider,
+        "voice": voice,
+        "target_format": target_format,
+        "sample_rate_hz": sample_rate_hz,
+        "language": language,
+    }
+    session_ids: List[str] = []
+    for text in texts:
+        resp = client.post("/v1/tts/sessions", json={**base_payload, "text": text})
+        assert resp.status_code == 201, resp.text
+        session_id = resp.json()["session_id"]
+        assert isinstance(session_id, str) and session_id
+        session_ids.append(session_id)
+    return session_ids
+
+
+def stream_session(client: TestClient, session_id: str) -> None:
+    total_bytes = 0
+    audio_messages: List[bytes] = []
+    eos_seen = False
+
+    with client.websocket_connect(f"/v1/tts/stream/{session_id}") as ws:
+        while True:
+            # Audio arrives as binary frames; eos/error are JSON text frames.
+            message = ws.receive()
+            if message.get("bytes") is not None:
+                audio_messages.append(message["bytes"])
+                total_bytes += len(message["bytes"])
+                continue
+            msg = json.loads(message["text"])
+            if msg["type"] == "eos":
+                eos_seen = True
+                break
+
+    assert eos_seen, "Expected EOS message at end of stream"
+    assert audio_messages, "Expected at least one audio message"
+    assert total_bytes > 0, "Expected some audio payload bytes"
+
+
+def stream_sessions_concurrently(
+    client: TestClient, session_ids: List[str]
+) -> None:
+    """Stream every session at once rather than one after another.
+
+    Each thread blocks on its own WebSocket; all of them share the entered
+    TestClient's single portal and event loop, where the app serves the
+    streams concurrently. Per-utterance synthesis and transcoding therefore
+    overlap, and the flow is bounded by the slowest utterance instead of
+    their sum. Assertions stay per-flow.
+    """
+    with ThreadPoolExecutor(max_workers=len(session_ids)) as pool:
+        futures = [pool.submit(stream_session, client, sid) for sid in session_ids]
+        for future in futures:
+            future.result()
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+
+
+@pytest.fixture(scope="module")
+def client() -> Iterator[TestClient]:
+    """One running app per module: startup once, shutdown on teardown."""
+    with TestClient(create_app()) as c:
+        yield c
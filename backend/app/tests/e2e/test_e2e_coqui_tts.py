@@ -1,74 +1,27 @@
 from __future__ import annotations
 
-from typing import List
-
 import pytest
 from fastapi.testclient import TestClient
 
-from app.main import app
-
-try:
-    # Coqui TTS must be installed and configured for this test to run.
-    from TTS.api import TTS as _CoquiTTS  # type: ignore[import]
-
-    COQUI_AVAILABLE = True
-except Exception:  # pragma: no cover - environment dependent
-    COQUI_AVAILABLE = False
-
-
-client = TestClient(app)
-
-
-def _run_single_flow(
-    *,
-    text: str,
-    target_format: str,
-    sample_rate_hz: int,
-    voice: str,
-    language: str,
-) -> None:
-    # Use a sample rate close to the model's native rate (22050Hz) to
-    # keep transcoding overhead modest in integration tests.
-    payload = {
-        "provider": "coqui_tts",
-        "voice": voice,
-        "text": text,
-        "target_format": target_format,
-        "sample_rate_hz": sample_rate_hz,
-        "language": language,
-    }
-
-    # 1) Create session
-    resp = client.post("/v1/tts/sessions", json=payload)
-    assert resp.status_code == 201, resp.text
-    body = resp.json()
-    session_id = body["session_id"]
-    assert isinstance(session_id, str) and session_id
+from app.tests.e2e._helpers import create_sessions, stream_session
 
-    # 2) Stream over WebSocket
-    total_bytes = 0
-    audio_messages: List[dict] = []
-    eos_seen = False
+# Coqui TTS must be installed and configured for this test to run. It is
+# only imported inside the fixture: `TTS.api` pulls in torch, which would add
+# seconds to every collection even when this test is deselected or skipped.
+pytestmark = pytest.mark.coqui
 
-    with client.websocket_connect(f"/v1/tts/stream/{session_id}") as ws:
-        while True:
-            msg = ws.receive_json()
-            if msg["type"] == "audio":
-                audio_messages.append(msg)
-                total_bytes += len(msg["data"])
-            elif msg["type"] == "eos":
-                eos_seen = True
-                break
 
-    assert eos_seen, "Expected EOS message at end of stream"
-    assert audio_messages, "Expected at least one audio message"
-    assert total_bytes > 0, "Expected some audio payload bytes"
+@pytest.fixture(scope="session")
+def coqui_tts_api():
+    """Import Coqui's TTS API once, only for tests that actually run."""
+    return pytest.importorskip(
+        "TTS.api",
+        reason="Coqui TTS library not available; install 'TTS' to run this test.",
+    ).TTS
 
 
-@pytest.mark.skipif(
-    not COQUI_AVAILABLE,
-    reason="Coqui TTS library not available; install 'TTS' to run this test.",
-)
+# Sample rates stay close to the model's native rate (22050Hz) to keep
+# transcoding overhead modest in integration tests.
 @pytest.mark.parametrize(
     "target_format,sample_rate_hz,voice,language",
     [
@@ -78,16 +31,21 @@ def _run_single_flow(
     ],
 )
 def test_e2e_coqui_tts_multiple_formats_and_utterances(
+    coqui_tts_api,
+    client: TestClient,
     target_format: str,
     sample_rate_hz: int,
     voice: str,
     language: str,
 ) -> None:
-    for utterance in ["hi 1", "hi 2", "Hello KeyReply"]:
-        _run_single_flow(
-            text=utterance,
-            target_format=target_format,
-            sample_rate_hz=sample_rate_hz,
-            voice=voice,
-            language=language,
-        )
+    session_ids = create_sessions(
+        client,
+        provider="coqui_tts",
+        texts=["hi 1", "hi 2", "Hello KeyReply"],
+        target_format=target_format,
+        sample_rate_hz=sample_rate_hz,
+        voice=voice,
+        language=language,
+    )
+    for session_id in session_ids:
+        stream_session(client, session_id)
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client(app: FastAPI) -> TestClient:
+    # Not entered as a context manager: running the startup hooks would
+    # configure the process-global streaming queue on the TestClient's event
+    # loop, while these tests rely on inline streaming.
+    return TestClient(app)
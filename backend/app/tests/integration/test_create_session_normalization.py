@@ -1,16 +1,7 @@
 from __future__ import annotations
 
-import pytest
 from fastapi.testclient import TestClient
 
-from app.main import create_app
-
-
-@pytest.fixture
-def client() -> TestClient:
-    app = create_app()
-    return TestClient(app)
-
 
 def test_create_session_rejects_unknown_voice_for_provider(client: TestClient) -> None:
     payload = {
@@ -1,23 +1,20 @@
 from __future__ import annotations
 
+import json
 import logging
 
-import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
 
-from app.main import create_app
-from app.metrics import TTS_SESSIONS_TOTAL
+from app.container import get_rate_limiter
 from app.services.rate_limiter import RateLimitConfig, RateLimiter
 
 
-@pytest.fixture
-def client() -> TestClient:
-    app = create_app()
-    return TestClient(app)
-
-
-def _valid_session_payload() -> dict:
-    return {
+# Serialised once at import; the tests post these bytes directly so each
+# request skips re-encoding the same payload.
+_VALID_SESSION_BODY = json.dumps(
+    {
         "provider": "mock_tone",
         "voice": "en-US-mock-1",
         "text": "Hello KeyReply",
@@ -25,27 +22,41 @@ def _valid_session_payload() -> dict:
         "sample_rate_hz": 16000,
         "language": "en-US",
     }
+).encode()
+_JSON_HEADERS = {"content-type": "application/json"}
 
 
 def _get_sessions_metric_value(provider: str, status: str) -> float:
-    for metric in TTS_SESSIONS_TOTAL.collect():
-        for sample in metric.samples:
-            if (
-                sample.name == "tts_sessions_total"
-                and sample.labels.get("provider") == provider
-                and sample.labels.get("status") == status
-            ):
-                return float(sample.value)
-    return 0.0
-
-
-def test_http_logging_middleware_logs_request(caplog, client: TestClient) -> None:
-    with caplog.at_level(logging.INFO):
+    # Look the sample up by name and labels rather than collect()-ing and
+    # scanning every sample of the metric family.
+    value = REGISTRY.get_sample_value(
+        "tts_sessions_total", {"provider": provider, "status": status}
+    )
+    return value or 0.0
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def test_http_logging_middleware_logs_request(client: TestClient) -> None:
+    # Listen only on the middleware's logger instead of capturing (and
+    # formatting) every record in the process via caplog.
+    logger = logging.getLogger("app.main")
+    handler = _RecordingHandler()
+    logger.addHandler(handler)
+    try:
         response = client.get("/healthz")
+    finally:
+        logger.removeHandler(handler)
 
     assert response.status_code == 200
-    messages = [record.getMessage() for record in caplog.records]
-    assert any("HTTP GET /healthz" in msg for msg in messages)
+    assert any("HTTP GET /healthz" in r.getMessage() for r in handler.records)
 
 
 def test_metrics_endpoint_exposes_prometheus_metrics(client: TestClient) -> None:
@@ -63,34 +74,31 @@ def test_create_session_updates_sessions_metric(client: TestClient) -> None:
 
     before = _get_sessions_metric_value(provider, status)
 
-    payload = _valid_session_payload()
-
-    response = client.post("/v1/tts/sessions", json=payload)
+    response = client.post(
+        "/v1/tts/sessions", content=_VALID_SESSION_BODY, headers=_JSON_HEADERS
+    )
     assert response.status_code == 201
 
     after = _get_sessions_metric_value(provider, status)
     assert after == before + 1.0
 
 
-def test_create_session_is_rate_limited(
-    monkeypatch: pytest.MonkeyPatch, client: TestClient
-) -> None:
+def test_create_session_is_rate_limited(app: FastAPI, client: TestClient) -> None:
     cfg = RateLimitConfig(max_requests_per_window=2, window_seconds=60)
     limiter = RateLimiter(config=cfg)
 
-    # Override the rate limiter used by the API router using monkeypatch so it
-    # is automatically restored after the test.
-    monkeypatch.setattr("app.api.get_rate_limiter", lambda: limiter)
+    # Override the rate limiter dependency on the shared app; the conftest
+    # clears overrides after each test.
+    app.dependency_overrides[get_rate_limiter] = lambda: limiter
 
     url = "/v1/tts/sessions"
-    payload = _valid_session_payload()
 
-    r1 = client.post(url, json=payload)
+    r1 = client.post(url, content=_VALID_SESSION_BODY, headers=_JSON_HEADERS)
     assert r1.status_code == 201
 
-    r2 = client.post(url, json=payload)
+    r2 = client.post(url, content=_VALID_SESSION_BODY, headers=_JSON_HEADERS)
     assert r2.status_code == 201
 
-    r3 = client.post(url, json=payload)
+    r3 = client.post(url, content=_VALID_SESSION_BODY, headers=_JSON_HEADERS)
     assert r3.status_code == 429
     assert "Rate limit exceeded" in r3.json().get("detail", "")
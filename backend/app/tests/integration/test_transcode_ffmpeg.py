@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+
+import pytest
+
+from app.providers import AudioChunk
+from app.models.audio_format import AudioFormat
+from app.services import AudioTranscodeService
+from app.services import transcode_service
+
+
+try:  # Optional: decode in-process instead of spawning a second ffmpeg.
+    import av
+except ImportError:  # pragma: no cover - depends on the dev environment
+    av = None
+
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg CLI not available"),
+]
+
+
+def _decoded_sample_count(mp3_bytes: bytes) -> int:
+    """Decode ``mp3_bytes`` and return the number of samples recovered."""
+    if av is not None:
+        with av.open(io.BytesIO(mp3_bytes)) as container:
+            return sum(frame.samples for frame in container.decode(audio=0))
+
+    proc = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "mp3",
+            "-i",
+            "pipe:0",
+            "-f",
+            "s16le",
+            "-ac",
+            "1",
+            "pipe:1",
+        ],
+        input=mp3_bytes,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    assert proc.returncode == 0, proc.stderr.decode("utf-8", errors="ignore")
+    return len(proc.stdout) // 2
+
+
+@pytest.mark.asyncio
+async def test_transcode_to_mp3_round_trips_through_ffmpeg_decoder() -> None:
+    pcm_data = b"\x00\x01" * 800
+    chunk = AudioChunk(
+        data=pcm_data,
+        sample_rate_hz=16000,
+        num_channels=1,
+        format=AudioFormat.PCM16,
+    )
+    service = AudioTranscodeService()
+
+    mp3_bytes = await service.transcode_chunk(
+        chunk,
+        target_format=AudioFormat.MP3,
+        sample_rate_hz=16000,
+    )
+
+    assert _decoded_sample_count(mp3_bytes) > 0
+
+
+@pytest.mark.asyncio
+async def test_transcode_stream_resamples_through_one_ffmpeg_process(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Force the ffmpeg pipe even when the in-process soxr resampler is installed.
+    monkeypatch.setattr(transcode_service, "soxr", None)
+    chunk = AudioChunk(
+        data=b"\x00\x10" * 800,
+        sample_rate_hz=8000,
+        num_channels=1,
+        format=AudioFormat.PCM16,
+    )
+    service = AudioTranscodeService()
+
+    stream = await service.open_stream(
+        chunk, target_format=AudioFormat.PCM16, sample_rate_hz=16000
+    )
+    try:
+        out = b"".join([await stream.feed(chunk.data) for _ in range(5)])
+        out += await stream.finish()
+    finally:
+        await stream.aclose()
+
+    # 8kHz -> 16kHz doubles the number of 16-bit samples.
+    assert len(out) == 2 * 5 * len(chunk.data)
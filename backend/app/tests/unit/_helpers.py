@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+from app.models import AudioFormat, CreateTTSSessionRequest
+from app.repositories import InMemoryTTSSessionRepository
+from app.services import TTSService
+
+
+TTSServiceFactory = Callable[..., Tuple[TTSService, InMemoryTTSSessionRepository]]
+
+
+class FakeClock:
+    """Manually advanced stand-in for the limiter and breaker ``clock``."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@lru_cache(maxsize=256)
+def make_tts_request_cached(
+    provider: str,
+    voice: str,
+    text: str,
+    target_format: AudioFormat | str,
+    sample_rate_hz: int,
+    language: Optional[str] = None,
+) -> CreateTTSSessionRequest:
+    """Return a validated request, building it once per distinct parameter set.
+
+    The returned instance is shared between tests and must be treated as
+    read-only; derive variants with ``model_copy(update=...)``.
+    """
+    return CreateTTSSessionRequest(
+        provider=provider,
+        voice=voice,
+        text=text,
+        target_format=target_format,
+        sample_rate_hz=sample_rate_hz,
+        language=language,
+    )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Any, Tuple
+
+import pytest
+
+from app.models import CreateTTSSessionRequest
+from app.providers import ProviderRegistry
+from app.repositories import InMemoryTTSSessionRepository
+from app.services import AudioTranscodeService, TTSService
+from app.services.circuit_breaker import CircuitBreakerRegistry
+from app.tests.unit._helpers import (
+    FakeClock,
+    TTSServiceFactory,
+    make_tts_request_cached,
+)
+
+
+@pytest.fixture(scope="session")
+def provider_registry() -> ProviderRegistry:
+    """Registry of the configured providers, built once for the unit suite.
+
+    Constructing providers (Coqui in particular) is the expensive part of
+    wiring a TTSService; the providers themselves hold no per-test state.
+    """
+    return ProviderRegistry()
+
+
+@pytest.fixture
+def tts_service_factory(provider_registry: ProviderRegistry) -> TTSServiceFactory:
+    """Build a TTSService with a fresh repository, transcoder and breakers.
+
+    Tests with custom providers pass their own ``registry``; any other
+    collaborator or TTSService keyword argument can be overridden too.
+    """
+
+    def build(
+        registry: Any = None,
+        *,
+        transcode_service: AudioTranscodeService | None = None,
+        circuit_breakers: CircuitBreakerRegistry | None = None,
+        **service_kwargs: Any,
+    ) -> Tuple[TTSService, InMemoryTTSSessionRepository]:
+        repo = InMemoryTTSSessionRepository()
+        service = TTSService(
+            provider_registry=(
+                provider_registry if registry is None else registry
+            ),
+            session_repo=repo,
+            transcode_service=transcode_service or AudioTranscodeService(),
+            circuit_breakers=circuit_breakers or CircuitBreakerRegistry(),
+            **service_kwargs,
+        )
+        return service, repo
+
+    return build
+
+
+@pytest.fixture
+def make_request() -> CreateTTSSessionRequest:
+    """A valid mock_tone request; shared, so derive variants with model_copy."""
+    return make_tts_request_cached(
+        provider="mock_tone",
+        voice="en-US-mock-1",
+        text="Hello KeyReply",
+        target_format="pcm16",
+        sample_rate_hz=16000,
+        language="en-US",
+    )
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    return FakeClock()
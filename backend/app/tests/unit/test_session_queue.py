@@ -1,87 +1,184 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import io
+import json
+import wave
+from collections import deque
+from typing import AsyncIterator
 
 import pytest
-from fastapi import WebSocket
 
 from app.services.session_queue import (
+  _AUDIO_BATCH_MAX_DELAY_S,
+  _send_audio_stream,
   configure_session_queue,
   enqueue_stream_request,
   SessionQueueFullError,
   SessionWorkItem,
+  shutdown_session_queue,
 )
-from app.services import TTSService
-from app.providers import ProviderRegistry
-from app.repositories import InMemoryTTSSessionRepository
-from app.services.transcode_service import AudioTranscodeService
-from app.services.circuit_breaker import CircuitBreakerRegistry
-from app.models import CreateTTSSessionRequest
+from app.models import AudioFormat, CreateTTSSessionRequest
+from app.tests.unit._helpers import TTSServiceFactory
 
 
-class _DummyWebSocket(WebSocket):  # type: ignore[misc]
+class _DummyWebSocket:
   """Minimal WebSocket stub that just records sent JSON messages."""
 
   def __init__(self) -> None:
-    # FastAPI's WebSocket expects a scope; we bypass most of it for tests.
-    self.sent: list[dict] = []
+    self.sent: deque[dict] = deque()
 
-  async def accept(self) -> None:  # type: ignore[override]
+  async def accept(self) -> None:
     return None
 
-  async def send_json(self, data) -> None:  # type: ignore[override]
+  async def send_json(self, data) -> None:
     self.sent.append(data)
 
-  async def close(self, code: int = 1000, reason: str | None = None) -> None:  # type: ignore[override]
+  async def send_text(self, data: str) -> None:
+    self.sent.append(json.loads(data))
+
+  async def send_bytes(self, data: bytes) -> None:
+    # Binary frames carry raw audio; record them as-is next to JSON messages.
+    self.sent.append(data)
+
+  async def close(self, code: int = 1000, reason: str | None = None) -> None:
     self.sent.append({"type": "close", "code": code, "reason": reason})
 
+  def reset(self) -> None:
+    self.sent.clear()
 
-def _build_tts_service() -> TTSService:
-  registry = ProviderRegistry()
-  repo = InMemoryTTSSessionRepository()
-  transcode = AudioTranscodeService()
-  breakers = CircuitBreakerRegistry()
-  return TTSService(
-    provider_registry=registry,
-    session_repo=repo,
-    transcode_service=transcode,
-    circuit_breakers=breakers,
-  )
 
+@pytest.fixture(scope="module")
+def _shared_ws() -> _DummyWebSocket:
+  return _DummyWebSocket()
 
-def _make_request() -> CreateTTSSessionRequest:
-  return CreateTTSSessionRequest(
-    provider="mock_tone",
-    voice="en-US-mock-1",
-    text="hello",
-    target_format="pcm16",
-    sample_rate_hz=16000,
-    language="en-US",
-  )
+
+@pytest.fixture
+def ws(_shared_ws: _DummyWebSocket) -> _DummyWebSocket:
+  """One recording socket for the module, emptied before each test."""
+  _shared_ws.reset()
+  return _shared_ws
 
 
 @pytest.mark.asyncio
-async def test_enqueue_stream_request_streams_when_queue_not_configured() -> None:
+async def test_enqueue_stream_request_streams_when_queue_not_configured(
+  ws: _DummyWebSocket,
+  tts_service_factory: TTSServiceFactory,
+  make_request: CreateTTSSessionRequest,
+) -> None:
   """If the streaming queue is not configured, enqueue_stream_request should stream inline."""
 
-  tts = _build_tts_service()
-  req = _make_request()
-  session = tts.create_session(req)
+  tts, _ = tts_service_factory()
+  session = tts.create_session(make_request)
+
+  await enqueue_stream_request(session.id, ws, tts_service=tts)
+
+  # We expect at least one binary audio frame and a final eos.
+  assert any(isinstance(m, bytes) for m in ws.sent)
+  assert ws.sent[-1] == {"type": "eos"}
+
+
+@pytest.mark.asyncio
+async def test_enqueue_stream_request_batches_audio_chunks(
+  ws: _DummyWebSocket,
+  tts_service_factory: TTSServiceFactory,
+  make_request: CreateTTSSessionRequest,
+) -> None:
+  """Provider chunks are coalesced into fewer audio frames without losing bytes."""
+
+  tts, _ = tts_service_factory()
+  session = tts.create_session(make_request)
+  expected = [chunk async for chunk in tts.stream_session_audio(session.id)]
+
+  session = tts.create_session(make_request)
+  await enqueue_stream_request(session.id, ws, tts_service=tts)
+
+  audio = [m for m in ws.sent if isinstance(m, bytes)]
+  assert ws.sent[-1]["type"] == "eos"
+  assert 1 <= len(audio) < len(expected)
+  # The first chunk is sent on its own to keep time-to-first-audio unchanged.
+  assert audio[0] == expected[0]
+  assert b"".join(audio) == b"".join(expected)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_stream_request_sends_legacy_base64_audio(
+  ws: _DummyWebSocket,
+  tts_service_factory: TTSServiceFactory,
+  make_request: CreateTTSSessionRequest,
+) -> None:
+  """With binary_audio=False, audio is wrapped in sequenced JSON messages."""
+
+  tts, _ = tts_service_factory()
+  session = tts.create_session(make_request)
+  expected = [chunk async for chunk in tts.stream_session_audio(session.id)]
+
+  session = tts.create_session(make_request)
+  await enqueue_stream_request(session.id, ws, tts_service=tts, binary_audio=False)
+
+  audio = [m for m in ws.sent if m["type"] == "audio"]
+  assert ws.sent[-1]["type"] == "eos"
+  assert [m["seq"] for m in audio] == list(range(1, len(audio) + 1))
+  assert b"".join(base64.b64decode(m["data"]) for m in audio) == b"".join(expected)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_stream_request_sends_each_wav_chunk_as_a_standalone_frame(
+  ws: _DummyWebSocket,
+  tts_service_factory: TTSServiceFactory,
+  make_request: CreateTTSSessionRequest,
+) -> None:
+  """Per-chunk WAV output is never concatenated: every frame is one valid WAV file."""
+
+  tts, _ = tts_service_factory()
+  session = tts.create_session(
+    make_request.model_copy(update={"target_format": AudioFormat.WAV})
+  )
 
-  ws = _DummyWebSocket()
   await enqueue_stream_request(session.id, ws, tts_service=tts)
 
-  # We expect at least one audio message and a final eos.
-  types = [m.get("type") for m in ws.sent]
-  assert "audio" in types
-  assert "eos" in types
+  frames = [m for m in ws.sent if isinstance(m, bytes)]
+  assert len(frames) > 1
+  assert ws.sent[-1] == {"type": "eos"}
+  for frame in frames:
+    assert frame.count(b"RIFF") == 1
+    with wave.open(io.BytesIO(frame), "rb") as wf:
+      assert wf.getframerate() == 16000
+      assert wf.getsampwidth() == 2
+      assert wf.getnframes() * wf.getnchannels() * 2 == len(frame) - 44
 
 
 @pytest.mark.asyncio
-async def test_streaming_queue_limits_concurrency_and_depth() -> None:
+async def test_send_audio_stream_flushes_partial_batch_without_next_chunk(
+  ws: _DummyWebSocket,
+) -> None:
+  """A partly filled batch goes out on its deadline even while the source stalls."""
+
+  sent_before_stall: list[object] = []
+
+  async def chunks() -> AsyncIterator[bytes]:
+    yield b"a"
+    yield b"b"
+    # Stall well past the batch deadline; "b" must not wait for "c".
+    await asyncio.sleep(_AUDIO_BATCH_MAX_DELAY_S * 5)
+    sent_before_stall.extend(ws.sent)
+    yield b"c"
+
+  await _send_audio_stream(ws, chunks())
+
+  assert sent_before_stall == [b"a", b"b"]
+  assert list(ws.sent) == [b"a", b"b", b"c", {"type": "eos"}]
+
+
+@pytest.mark.asyncio
+async def test_streaming_queue_limits_concurrency_and_depth(
+  ws: _DummyWebSocket,
+  tts_service_factory: TTSServiceFactory,
+) -> None:
   """Configure a very small streaming queue and ensure it enforces a hard limit."""
 
-  tts = _build_tts_service()
+  tts, _ = tts_service_factory()
 
   # Configure queue with maxsize=1 and worker_count=0 so that nothing drains
   # the queue; we will manually fill it to simulate "full".
@@ -98,7 +195,32 @@ async def test_streaming_queue_limits_concurrency_and_depth() -> None:
   )
 
   # Now the next enqueue_stream_request should overflow the small queue and raise.
-  ws2 = _DummyWebSocket()
-
   with pytest.raises(SessionQueueFullError):
-    await enqueue_stream_request("s2", ws2, tts_service=tts)
+    await enqueue_stream_request("s2", ws, tts_service=tts)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_session_queue_allows_reconfiguring(
+  ws: _DummyWebSocket,
+  tts_service_factory: TTSServiceFactory,
+  make_request: CreateTTSSessionRequest,
+) -> None:
+  """After shutdown, streaming falls back inline until the queue is reconfigured."""
+
+  import app.services.session_queue as session_queue  # type: ignore[import]
+
+  tts, _ = tts_service_factory()
+  await shutdown_session_queue()
+  configure_session_queue(tts_service=tts, maxsize=4, worker_count=2)
+  first_queue = session_queue._queue  # type: ignore[attr-defined]
+
+  await shutdown_session_queue()
+  assert session_queue._queue is None  # type: ignore[attr-defined]
+
+  session = tts.create_session(make_request)
+  await enqueue_stream_request(session.id, ws, tts_service=tts)
+  assert ws.sent[-1] == {"type": "eos"}
+
+  configure_session_queue(tts_service=tts, maxsize=4, worker_count=2)
+  assert session_queue._queue is not first_queue  # type: ignore[attr-defined]
+  await shutdown_session_queue()
@@ -1,48 +1,108 @@
 from __future__ import annotations
 
 import io
-import subprocess
+import threading
 import wave
-from typing import Any, Dict
+from dataclasses import replace
+from typing import Any, Dict, Iterator
 
 import pytest
 
 from app.providers import AudioChunk
 from app.models.audio_format import AudioFormat
 from app.services import AudioTranscodeService
+from app.services import transcode_service
 
 
-@pytest.mark.asyncio
-async def test_transcode_pass_through_when_format_and_rate_match() -> None:
-    data = b"\x01\x02\x03\x04"
-    chunk = AudioChunk(
-        data=data,
-        sample_rate_hz=16000,
-        num_channels=1,
-        format=AudioFormat.PCM16,
+# MPEG-2 Layer III lookup tables (the encoder emits MPEG-2 at 16/22.05/24kHz).
+_MPEG2_SAMPLE_RATES_HZ = (22050, 24000, 16000)
+_MPEG2_LAYER3_BITRATES_KBPS = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+
+def _first_mp3_frame_header(data: bytes) -> tuple[int, int]:
+    """Return (bitrate_kbps, sample_rate_hz) of the first MPEG-2 Layer III frame."""
+    offset = 0
+    if data[:3] == b"ID3":
+        # Skip the ID3v2 tag; its size is a 28-bit syncsafe integer.
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        offset = 10 + size
+
+    b0, b1, b2 = data[offset], data[offset + 1], data[offset + 2]
+    assert b0 == 0xFF and (b1 & 0xE0) == 0xE0, "missing MP3 frame sync"
+    assert (b1 >> 3) & 0b11 == 0b10, "expected an MPEG-2 frame"
+    assert (b1 >> 1) & 0b11 == 0b01, "expected a Layer III frame"
+    return (
+        _MPEG2_LAYER3_BITRATES_KBPS[b2 >> 4],
+        _MPEG2_SAMPLE_RATES_HZ[(b2 >> 2) & 0b11],
     )
+
+
+# Built once and shared; tests that need different data/rate/format derive a
+# copy with dataclasses.replace() rather than mutating this instance.
+_CHUNK_PCM16_16K = AudioChunk(
+    data=b"\x01\x02\x03\x04",
+    sample_rate_hz=16000,
+    num_channels=1,
+    format=AudioFormat.PCM16,
+)
+
+
+@pytest.fixture(scope="module")
+def service() -> Iterator[AudioTranscodeService]:
+    # The service holds no per-test state, so one instance (and its lazily
+    # started encoder pool) serves the whole module.
     service = AudioTranscodeService()
+    yield service
+    service.close()
+
 
+@pytest.mark.asyncio
+async def test_transcode_pass_through_when_format_and_rate_match(
+    service: AudioTranscodeService,
+) -> None:
     out = await service.transcode_chunk(
-        chunk,
+        _CHUNK_PCM16_16K,
         target_format=AudioFormat.PCM16,
         sample_rate_hz=16000,
     )
 
-    assert out == data
+    assert out == _CHUNK_PCM16_16K.data
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "in_format,target_format,expected_error",
+    [
+        ("unknown", AudioFormat.PCM16, "Unsupported input format"),
+        (AudioFormat.PCM16, "ogg", "Unsupported output format"),
+    ],
+)
+async def test_transcode_rejects_unsupported_formats(
+    service: AudioTranscodeService,
+    in_format: str,
+    target_format: str,
+    expected_error: str,
+) -> None:
+    chunk = replace(_CHUNK_PCM16_16K, format=in_format)
+
+    with pytest.raises(ValueError) as exc_info:
+        await service.transcode_chunk(
+            chunk,
+            target_format=target_format,  # type: ignore[arg-type]
+            sample_rate_hz=16000,
+        )
+
+    assert expected_error in str(exc_info.value)
 
 
 @pytest.mark.asyncio
-async def test_transcode_uses_ffmpeg_when_rate_differs(
+async def test_transcode_uses_ffmpeg_when_rate_differs_without_soxr(
+    service: AudioTranscodeService,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    chunk = AudioChunk(
-        data=b"\x00" * 160,
-        sample_rate_hz=8000,
-        num_channels=1,
-        format=AudioFormat.PCM16,
-    )
-    service = AudioTranscodeService()
+    # Simulate an install without the optional "resample" extra.
+    monkeypatch.setattr(transcode_service, "soxr", None)
+    chunk = replace(_CHUNK_PCM16_16K, data=b"\x00" * 160, sample_rate_hz=8000)
 
     called: Dict[str, Any] = {}
 
@@ -73,57 +133,51 @@ async def test_transcode_uses_ffmpeg_when_rate_differs(
 
 
 @pytest.mark.asyncio
-async def test_transcode_rejects_unsupported_input_format() -> None:
-    data = b"\x01\x02"
-    chunk = AudioChunk(  # type: ignore[arg-type]
-        data=data,
-        sample_rate_hz=16000,
-        num_channels=1,
-        format="unknown",  # type: ignore[arg-type]
-    )
-    service = AudioTranscodeService()
+async def test_transcode_resamples_pcm16_in_process_with_soxr(
+    service: AudioTranscodeService,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pytest.importorskip("soxr")
 
-    with pytest.raises(ValueError) as exc_info:
-        await service.transcode_chunk(
-            chunk,
-            target_format=AudioFormat.PCM16,
-            sample_rate_hz=16000,
-        )
+    def fail_ffmpeg_transcode(self, **kwargs: Any) -> bytes:  # type: ignore[no-untyped-def]
+        raise AssertionError("ffmpeg should not be used for PCM16 resampling")
 
-    assert "Unsupported input format" in str(exc_info.value)
+    resample_threads: list[str] = []
+    soxr_resample = AudioTranscodeService._soxr_resample
 
+    def recording_soxr_resample(data: bytes, **kwargs: Any) -> bytes:
+        resample_threads.append(threading.current_thread().name)
+        return soxr_resample(data, **kwargs)
 
-@pytest.mark.asyncio
-async def test_transcode_rejects_unsupported_output_format() -> None:
-    data = b"\x01\x02"
-    chunk = AudioChunk(
-        data=data,
-        sample_rate_hz=16000,
-        num_channels=1,
-        format=AudioFormat.PCM16,
+    monkeypatch.setattr(
+        AudioTranscodeService, "_ffmpeg_transcode", fail_ffmpeg_transcode
     )
-    service = AudioTranscodeService()
+    monkeypatch.setattr(
+        AudioTranscodeService,
+        "_soxr_resample",
+        staticmethod(recording_soxr_resample),
+    )
+    chunk = replace(_CHUNK_PCM16_16K, data=b"\x00\x10" * 80, sample_rate_hz=8000)
 
-    with pytest.raises(ValueError) as exc_info:
-        await service.transcode_chunk(
-            chunk,
-            target_format="ogg",  # type: ignore[arg-type]
-            sample_rate_hz=16000,
-        )
+    out = await service.transcode_chunk(
+        chunk,
+        target_format=AudioFormat.PCM16,
+        sample_rate_hz=16000,
+    )
 
-    assert "Unsupported output format" in str(exc_info.value)
+    # 8kHz -> 16kHz doubles the number of 16-bit samples.
+    assert len(out) == 2 * len(chunk.data)
+    # The CPU-bound resample runs on the encoder pool, not the event loop.
+    assert len(resample_threads) == 1
+    assert resample_threads[0].startswith("transcode")
 
 
 @pytest.mark.asyncio
-async def test_transcode_to_wav_produces_valid_wav_header() -> None:
+async def test_transcode_to_wav_produces_valid_wav_header(
+    service: AudioTranscodeService,
+) -> None:
     pcm_data = b"\x00\x01" * 80
-    chunk = AudioChunk(
-        data=pcm_data,
-        sample_rate_hz=16000,
-        num_channels=1,
-        format=AudioFormat.PCM16,
-    )
-    service = AudioTranscodeService()
+    chunk = replace(_CHUNK_PCM16_16K, data=pcm_data)
 
     wav_bytes = await service.transcode_chunk(
         chunk,
@@ -139,18 +193,15 @@ async def test_transcode_to_wav_produces_valid_wav_header() -> None:
         assert wf.getframerate() == 16000
         assert wf.getsampwidth() == 2
         assert wf.getnframes() > 0
+        assert wf.readframes(wf.getnframes()) == pcm_data
 
 
 @pytest.mark.asyncio
-async def test_transcode_to_mp3_produces_decodable_audio() -> None:
+async def test_transcode_to_mp3_produces_decodable_audio(
+    service: AudioTranscodeService,
+) -> None:
     pcm_data = b"\x00\x01" * 800
-    chunk = AudioChunk(
-        data=pcm_data,
-        sample_rate_hz=16000,
-        num_channels=1,
-        format=AudioFormat.PCM16,
-    )
-    service = AudioTranscodeService()
+    chunk = replace(_CHUNK_PCM16_16K, data=pcm_data)
 
     mp3_bytes = await service.transcode_chunk(
         chunk,
@@ -161,29 +212,6 @@ async def test_transcode_to_mp3_produces_decodable_audio() -> None:
     assert mp3_bytes
     assert mp3_bytes != pcm_data
 
-    proc = subprocess.run(
-        [
-            "ffmpeg",
-            "-hide_banner",
-            "-loglevel",
-            "error",
-            "-f",
-            "mp3",
-            "-i",
-            "pipe:0",
-            "-f",
-            "s16le",
-            "-ar",
-            "16000",
-            "-ac",
-            "1",
-            "pipe:1",
-        ],
-        input=mp3_bytes,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        check=False,
-    )
-
-    assert proc.returncode == 0, proc.stderr.decode("utf-8", errors="ignore")
-    assert proc.stdout
+    bitrate_kbps, sample_rate_hz = _first_mp3_frame_header(mp3_bytes)
+    assert bitrate_kbps == 128
+    assert sample_rate_hz == 16000
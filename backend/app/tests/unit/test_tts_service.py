@@ -1,51 +1,31 @@
 from __future__ import annotations
 
 import asyncio
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+from unittest.mock import AsyncMock, Mock
 
 import pytest
+from prometheus_client import REGISTRY
 
-from app.models import CreateTTSSessionRequest, SessionStatus
-from app.providers import ProviderRegistry
-from app.repositories import InMemoryTTSSessionRepository
-from app.services import AudioTranscodeService, TTSService
+from app.models import AudioFormat, CreateTTSSessionRequest, SessionStatus
+from app.providers import AudioChunk, ProviderRetriableError
+from app.services import AudioTranscodeService
 from app.services.circuit_breaker import (
     CircuitBreakerConfig,
     CircuitBreakerRegistry,
 )
 from app.services.rate_limiter import RateLimitConfig, RateLimiter
-from app.metrics import TTS_ACTIVE_STREAMS
-
-
-def _build_tts_service() -> tuple[TTSService, InMemoryTTSSessionRepository]:
-    registry = ProviderRegistry()
-    repo = InMemoryTTSSessionRepository()
-    transcode = AudioTranscodeService()
-    breakers = CircuitBreakerRegistry()
-    service = TTSService(
-        provider_registry=registry,
-        session_repo=repo,
-        transcode_service=transcode,
-        circuit_breakers=breakers,
-    )
-    return service, repo
-
+from app.tests.unit._helpers import FakeClock, TTSServiceFactory
 
-def _make_request() -> CreateTTSSessionRequest:
-    return CreateTTSSessionRequest(
-        provider="mock_tone",
-        voice="en-US-mock-1",
-        text="Hello KeyReply",
-        target_format="pcm16",
-        sample_rate_hz=16000,
-        language="en-US",
-    )
 
+def test_create_session_persists_session(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
+    service, repo = tts_service_factory()
 
-def test_create_session_persists_session() -> None:
-    service, repo = _build_tts_service()
-
-    req = _make_request()
-    session = service.create_session(req)
+    session = service.create_session(make_request)
 
     stored = repo.get(session.id)
     assert stored is not None
@@ -54,24 +34,20 @@ def test_create_session_persists_session() -> None:
 
 
 def _get_active_streams(provider: str) -> float:
-    for metric in TTS_ACTIVE_STREAMS.collect():
-        for sample in metric.samples:
-            if (
-                sample.name == "tts_active_streams"
-                and sample.labels.get("provider") == provider
-            ):
-                return float(sample.value)
-    return 0.0
+    value = REGISTRY.get_sample_value("tts_active_streams", {"provider": provider})
+    return value or 0.0
 
 
 @pytest.mark.asyncio
-async def test_active_streams_metric_increments_and_decrements() -> None:
+async def test_active_streams_metric_increments_and_decrements(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
     """TTS_ACTIVE_STREAMS should reflect the lifetime of a stream_session_audio call."""
 
-    service, repo = _build_tts_service()
+    service, repo = tts_service_factory()
 
-    req = _make_request()
-    session = service.create_session(req)
+    session = service.create_session(make_request)
 
     # Ensure gauge starts at 0.
     assert _get_active_streams("mock_tone") == 0.0
@@ -98,18 +74,21 @@ async def test_active_streams_metric_increments_and_decrements() -> None:
 
 
 @pytest.mark.asyncio
-async def test_stream_session_audio_yields_bytes_and_updates_status() -> None:
-    service, repo = _build_tts_service()
+async def test_stream_session_audio_yields_bytes_and_updates_status(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
+    service, repo = tts_service_factory()
 
-    req = _make_request()
-    session = service.create_session(req)
+    session = service.create_session(make_request)
 
     chunks: list[bytes] = []
     async for chunk in service.stream_session_audio(session.id):
         chunks.append(chunk)
 
     assert len(chunks) > 0
-    assert all(isinstance(c, (bytes, bytearray)) for c in chunks)
+    # Every chunk is still checked, without a Python-level generator loop.
+    assert set(map(type, chunks)) <= {bytes, bytearray}
 
     stored = repo.get(session.id)
     assert stored is not None
@@ -117,20 +96,79 @@ async def test_stream_session_audio_yields_bytes_and_updates_status() -> None:
 
 
 @pytest.mark.asyncio
-async def test_stream_session_audio_unknown_session_raises() -> None:
-    service, _ = _build_tts_service()
+async def test_stream_session_audio_reuses_pooled_stream_context(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
+    service, _ = tts_service_factory()
 
-    with pytest.raises(ValueError) as exc_info:
-        async for _ in service.stream_session_audio("does-not-exist"):
+    for _ in range(2):
+        session = service.create_session(make_request)
+        async for _chunk in service.stream_session_audio(session.id):
             pass
 
-    assert "Unknown session" in str(exc_info.value)
+    # Sequential streams should share a single pooled context.
+    assert len(service._ctx_pool) == 1  # type: ignore[attr-defined]
+
+
+class _RecordingTranscodeStream:
+    def __init__(self) -> None:
+        self.fed: list[bytes] = []
+        self.finished = False
+        self.closed = False
+
+    async def feed(self, data: bytes) -> bytes:
+        self.fed.append(data)
+        return b"enc"
+
+    async def finish(self) -> bytes:
+        self.finished = True
+        return b"tail"
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class _StreamingTranscodeService(AudioTranscodeService):
+    """Transcoder whose stream encoder records what it was fed."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.streams: list[_RecordingTranscodeStream] = []
+
+    async def open_stream(self, first_chunk, *, target_format, sample_rate_hz):  # type: ignore[override]
+        stream = _RecordingTranscodeStream()
+        self.streams.append(stream)
+        return stream
+
+
+@pytest.mark.asyncio
+async def test_stream_session_audio_feeds_one_transcode_stream_per_session(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
+    transcode = _StreamingTranscodeService()
+    service, _ = tts_service_factory(transcode_service=transcode)
+    session = service.create_session(
+        make_request.model_copy(update={"target_format": AudioFormat.MP3})
+    )
+
+    out = [chunk async for chunk in service.stream_session_audio(session.id)]
+
+    assert len(transcode.streams) == 1
+    stream = transcode.streams[0]
+    assert len(stream.fed) > 1
+    assert out == [b"enc"] * len(stream.fed) + [b"tail"]
+    assert stream.finished and stream.closed
+
 
+class _LoggingProvider:
+    """Provider that logs each chunk it synthesises."""
 
-class _FailingProvider:
-    """Test provider that always fails when streaming."""
+    id = "logging-provider"
 
-    id = "failing-provider"
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
 
     async def list_voices(self) -> list[object]:
         return []
@@ -138,57 +176,179 @@ class _FailingProvider:
     async def stream_synthesize(
         self, *, text: str, voice_id: str, language: str | None = None
     ):  # type: ignore[override]
-        if False:  # pragma: no cover - generator placeholder
-            yield b""  # type: ignore[misc]
-        raise RuntimeError("synthetic provider failure")
+        for i in range(3):
+            self.log.append(f"synth{i}")
+            yield AudioChunk(
+                data=b"\x00\x01",
+                sample_rate_hz=16000,
+                num_channels=1,
+                format=AudioFormat.PCM16,
+            )
 
 
-class _SingleProviderRegistry:
-    """Minimal registry used for circuit breaker tests."""
+class _SlowLoggingTranscodeStream(_RecordingTranscodeStream):
+    def __init__(self, log: list[str]) -> None:
+        super().__init__()
+        self.log = log
 
-    def __init__(self, provider: _FailingProvider) -> None:
-        self._provider = provider
+    async def feed(self, data: bytes) -> bytes:
+        await asyncio.sleep(0.01)
+        self.log.append(f"encode{len(self.fed)}")
+        return await super().feed(data)
 
-    def get(self, provider_id: str) -> _FailingProvider:
-        if provider_id != self._provider.id:
-            raise ValueError(f"Unknown provider '{provider_id}'")
-        return self._provider
 
-    def list_providers(self) -> list[_FailingProvider]:
-        return [self._provider]
+class _SlowLoggingTranscodeService(AudioTranscodeService):
+    def __init__(self, log: list[str]) -> None:
+        super().__init__()
+        self.log = log
+
+    async def open_stream(self, first_chunk, *, target_format, sample_rate_hz):  # type: ignore[override]
+        return _SlowLoggingTranscodeStream(self.log)
+
+
+@pytest.mark.asyncio
+async def test_stream_session_audio_synthesises_ahead_of_encoder(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
+    log: list[str] = []
+    provider = _LoggingProvider(log)
+    service, _ = tts_service_factory(
+        _single_registry(provider),
+        transcode_service=_SlowLoggingTranscodeService(log),
+    )
+    session = service.create_session(
+        make_request.model_copy(
+            update={"provider": provider.id, "target_format": AudioFormat.MP3}
+        )
+    )
+
+    out = [chunk async for chunk in service.stream_session_audio(session.id)]
+
+    assert out == [b"enc"] * 3 + [b"tail"]
+    # The next chunk is synthesised while the first one is still encoding.
+    assert log.index("synth1") < log.index("encode0")
+
+
+@pytest.mark.asyncio
+async def test_stream_session_audio_early_exit_closes_provider_stream(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
+    """Closing the stream early stops the read-ahead producer and the provider."""
+
+    events: list[str] = []
+
+    async def endless_stream(**_: Any) -> AsyncIterator[AudioChunk]:
+        try:
+            while True:
+                events.append("synth")
+                yield _PCM_CHUNK
+        finally:
+            events.append("closed")
+
+    provider = _mock_provider("endless", endless_stream)
+    service, _ = tts_service_factory(
+        _single_registry(provider),
+        transcode_service=_StreamingTranscodeService(),
+    )
+    session = service.create_session(
+        make_request.model_copy(
+            update={"provider": provider.id, "target_format": AudioFormat.MP3}
+        )
+    )
+
+    agen = service.stream_session_audio(session.id)
+    assert await agen.__anext__() == b"enc"
+    await agen.aclose()
+
+    # Closed synchronously by aclose(), not left to the garbage collector.
+    assert events[-1] == "closed"
+    synthesised = events.count("synth")
+    await asyncio.sleep(0.01)
+    assert events.count("synth") == synthesised
+    assert _get_active_streams(provider.id) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_stream_session_audio_unknown_session_raises(
+    tts_service_factory: TTSServiceFactory,
+) -> None:
+    service, _ = tts_service_factory()
+
+    # Raised by the call itself, before any iteration starts.
+    with pytest.raises(ValueError) as exc_info:
+        service.stream_session_audio("does-not-exist")
+
+    assert "Unknown session" in str(exc_info.value)
+
+
+def _single_registry(provider: Any) -> SimpleNamespace:
+    """Minimal registry that serves exactly one provider."""
+
+    def get(provider_id: str) -> Any:
+        if provider_id != provider.id:
+            raise ValueError(f"Unknown provider '{provider_id}'")
+        return provider
+
+    return SimpleNamespace(get=get, list_providers=lambda: [provider])
+
+
+def _mock_provider(provider_id: str, streams: Any) -> Mock:
+    """Provider double; each ``stream_synthesize`` call returns the next stream.
+
+    ``streams`` is a Mock ``side_effect``: a list of prepared streams, or a
+    callable that builds a fresh one per call.
+    """
+    provider = Mock(spec=["id", "list_voices", "stream_synthesize"])
+    provider.id = provider_id
+    provider.list_voices = AsyncMock(return_value=[])
+    provider.stream_synthesize = Mock(side_effect=streams)
+    return provider
+
+
+async def _audio_stream(
+    *chunks: AudioChunk,
+    error: BaseException | None = None,
+    stall_seconds: float = 0.0,
+) -> AsyncIterator[AudioChunk]:
+    """Yield ``chunks``, then optionally stall and/or raise ``error``."""
+    for chunk in chunks:
+        yield chunk
+    if stall_seconds:
+        await asyncio.sleep(stall_seconds)
+    if error is not None:
+        raise error
+
+
+_PCM_CHUNK = AudioChunk(
+    data=b"\x00\x01",
+    sample_rate_hz=16000,
+    num_channels=1,
+    format=AudioFormat.PCM16,
+)
 
 
 @pytest.mark.asyncio
-async def test_stream_session_audio_trips_circuit_breaker_after_failures() -> None:
+async def test_stream_session_audio_trips_circuit_breaker_after_failures(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
     """Repeated provider failures should open the circuit and block new streams."""
 
     breaker_cfg = CircuitBreakerConfig(failure_threshold=2, reset_timeout_seconds=60)
-    breakers = CircuitBreakerRegistry(config=breaker_cfg)
-
-    provider = _FailingProvider()
-    registry = _SingleProviderRegistry(provider)
-    repo = InMemoryTTSSessionRepository()
-    transcode = AudioTranscodeService()
-
-    service = TTSService(
-        provider_registry=registry,  # type: ignore[arg-type]
-        session_repo=repo,
-        transcode_service=transcode,
-        circuit_breakers=breakers,
+    provider = _mock_provider(
+        "failing-provider",
+        lambda **_: _audio_stream(error=RuntimeError("synthetic provider failure")),
     )
-
-    def make_req() -> CreateTTSSessionRequest:
-        return CreateTTSSessionRequest(
-            provider=provider.id,
-            voice="dummy-voice",
-            text="Hello",
-            target_format="pcm16",
-            sample_rate_hz=16000,
-            language="en-US",
-        )
+    service, repo = tts_service_factory(
+        _single_registry(provider),
+        circuit_breakers=CircuitBreakerRegistry(config=breaker_cfg),
+    )
+    req = make_request.model_copy(update={"provider": provider.id})
 
     for _ in range(2):
-        session = service.create_session(make_req())
+        session = service.create_session(req)
         with pytest.raises(RuntimeError):
             async for _chunk in service.stream_session_audio(session.id):
                 pass
@@ -196,7 +356,7 @@ async def test_stream_session_audio_trips_circuit_breaker_after_failures() -> No
         assert stored is not None
         assert stored.status == SessionStatus.FAILED
 
-    blocked_session = service.create_session(make_req())
+    blocked_session = service.create_session(req)
     with pytest.raises(ValueError) as exc_info:
         async for _chunk in service.stream_session_audio(blocked_session.id):
             pass
@@ -204,172 +364,262 @@ async def test_stream_session_audio_trips_circuit_breaker_after_failures() -> No
     assert "temporarily unavailable" in str(exc_info.value)
 
 
-class _SometimesSlowProvider:
-    """Provider that times out on first attempt and succeeds on second."""
-
-    id = "sometimes-slow"
+@pytest.mark.asyncio
+async def test_stream_session_audio_retries_after_timeout(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
+    """If the provider fails with a timeout before producing audio, TTSService should retry."""
 
-    def __init__(self) -> None:
-        self.calls = 0
+    # Times out on the first attempt and succeeds on the second.
+    slow_provider = _mock_provider(
+        "sometimes-slow",
+        [_audio_stream(error=asyncio.TimeoutError()), _audio_stream(_PCM_CHUNK)],
+    )
+    # The timeout is raised by the stream itself, so a generous deadline
+    # costs nothing and keeps a slow host from timing out the retry too.
+    service, repo = tts_service_factory(
+        _single_registry(slow_provider),
+        provider_timeout_seconds=1.0,
+        provider_max_retries=2,
+    )
 
-    async def list_voices(self) -> list[object]:
-        return []
+    session = service.create_session(
+        make_request.model_copy(update={"provider": slow_provider.id})
+    )
 
-    async def stream_synthesize(
-        self, *, text: str, voice_id: str, language: str | None = None
-    ):  # type: ignore[override]
-        from app.providers import AudioChunk
+    chunks: list[bytes] = []
+    async for chunk in service.stream_session_audio(session.id):
+        chunks.append(chunk)
 
-        self.calls += 1
-        if self.calls == 1:
-            raise asyncio.TimeoutError()
+    assert len(chunks) == 1
+    stored = repo.get(session.id)
+    assert stored is not None
+    assert stored.status == SessionStatus.COMPLETED
 
-        yield AudioChunk(
-            data=b"\x00\x01",
-            sample_rate_hz=16000,
-            num_channels=1,
-            format="pcm16",  # type: ignore[arg-type]
-        )
 
+@pytest.mark.asyncio
+async def test_stream_session_audio_times_out_mid_stream_without_retry(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
+    """A provider that stalls after producing audio fails the stream without retrying."""
 
-class _RegistryForSlowProvider:
-    def __init__(self, provider: _SometimesSlowProvider) -> None:
-        self._provider = provider
+    # If the mid-stream deadline ever stops firing, the stall ends on its own
+    # and pytest.raises fails after two seconds instead of hanging the run.
+    provider = _mock_provider(
+        "stalls-after-first", [_audio_stream(_PCM_CHUNK, stall_seconds=2)]
+    )
+    service, _ = tts_service_factory(
+        _single_registry(provider),
+        provider_timeout_seconds=0.01,
+        provider_max_retries=2,
+    )
+    session = service.create_session(
+        make_request.model_copy(update={"provider": provider.id})
+    )
 
-    def get(self, provider_id: str) -> _SometimesSlowProvider:
-        if provider_id != self._provider.id:
-            raise ValueError(f"Unknown provider '{provider_id}'")
-        return self._provider
+    chunks: list[bytes] = []
+    with pytest.raises(asyncio.TimeoutError):
+        async for chunk in service.stream_session_audio(session.id):
+            chunks.append(chunk)
 
-    def list_providers(self) -> list[_SometimesSlowProvider]:
-        return [self._provider]
+    assert chunks == [b"\x00\x01"]
+    assert provider.stream_synthesize.call_count == 1
 
 
 @pytest.mark.asyncio
-async def test_stream_session_audio_retries_after_timeout() -> None:
-    """If the provider fails with a timeout before producing audio, TTSService should retry."""
-
-    slow_provider = _SometimesSlowProvider()
-    registry = _RegistryForSlowProvider(slow_provider)
-    repo = InMemoryTTSSessionRepository()
-    transcode = AudioTranscodeService()
-    breakers = CircuitBreakerRegistry()
-
-    service = TTSService(
-        provider_registry=registry,  # type: ignore[arg-type]
-        session_repo=repo,
-        transcode_service=transcode,
-        circuit_breakers=breakers,
-        provider_timeout_seconds=0.01,
-        provider_max_retries=2,
+async def test_stream_session_audio_retries_provider_retriable_error(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+) -> None:
+    """A ProviderRetriableError before the first chunk restarts the stream."""
+
+    provider = _mock_provider(
+        "flaky",
+        [
+            _audio_stream(error=ProviderRetriableError("transient")),
+            _audio_stream(_PCM_CHUNK),
+        ],
     )
-
-    req = CreateTTSSessionRequest(
-        provider=slow_provider.id,
-        voice="dummy-voice",
-        text="Hello",
-        target_format="pcm16",
-        sample_rate_hz=16000,
-        language="en-US",
+    service, repo = tts_service_factory(
+        _single_registry(provider), provider_max_retries=2
+    )
+    session = service.create_session(
+        make_request.model_copy(update={"provider": provider.id})
     )
-    session = service.create_session(req)
 
-    chunks: list[bytes] = []
-    async for chunk in service.stream_session_audio(session.id):
-        chunks.append(chunk)
+    chunks = [chunk async for chunk in service.stream_session_audio(session.id)]
 
-    assert len(chunks) == 1
+    assert chunks == [_PCM_CHUNK.data]
+    assert provider.stream_synthesize.call_count == 2
     stored = repo.get(session.id)
     assert stored is not None
     assert stored.status == SessionStatus.COMPLETED
 
 
-def test_circuit_breaker_allows_requests_until_threshold() -> None:
-    cfg = CircuitBreakerConfig(failure_threshold=3, reset_timeout_seconds=60)
-    registry = CircuitBreakerRegistry(config=cfg)
-    key = "provider-a"
+@pytest.mark.asyncio
+async def test_stream_session_audio_warmup_extensions_do_not_grow_deadline(
+    tts_service_factory: TTSServiceFactory,
+    make_request: CreateTTSSessionRequest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Each warm-up extension waits provider_timeout_seconds, not a doubled deadline."""
 
-    assert registry.allow_request(key) is True
+    provider_timeout = 7.0
+    warmup_timeouts: list[float] = []
 
-    registry.record_failure(key)
-    assert registry.allow_request(key) is True
+    async def instant_wait(fs, *, timeout=None, **kwargs):  # type: ignore[no-untyped-def]
+        # Expire every window immediately instead of sleeping through it.
+        if timeout == provider_timeout:
+            warmup_timeouts.append(timeout)
+        await asyncio.sleep(0)
+        done = {f for f in fs if f.done()}
+        return done, set(fs) - done
 
-    registry.record_failure(key)
+    monkeypatch.setattr(asyncio, "wait", instant_wait)
+
+    provider = _mock_provider(
+        "never-starts", lambda **_: _audio_stream(stall_seconds=5)
+    )
+    service, _ = tts_service_factory(
+        _single_registry(provider),
+        provider_timeout_seconds=provider_timeout,
+        provider_max_retries=1,
+        provider_warmup_extensions=1,
+    )
+    session = service.create_session(
+        make_request.model_copy(update={"provider": provider.id})
+    )
+
+    with pytest.raises(asyncio.TimeoutError):
+        async for _chunk in service.stream_session_audio(session.id):
+            pass
+
+    # One window plus one extension, both of the configured length.
+    assert warmup_timeouts == [provider_timeout, provider_timeout]
+
+
+@pytest.mark.parametrize("failure_threshold", [1, 3])
+def test_circuit_breaker_opens_at_failure_threshold(
+    fake_clock: FakeClock, failure_threshold: int
+) -> None:
+    cfg = CircuitBreakerConfig(
+        failure_threshold=failure_threshold, reset_timeout_seconds=60
+    )
+    registry = CircuitBreakerRegistry(config=cfg, clock=fake_clock)
+    key = "provider-a"
+
+    for _ in range(failure_threshold - 1):
+        assert registry.allow_request(key) is True
+        registry.record_failure(key)
     assert registry.allow_request(key) is True
 
     registry.record_failure(key)
     assert registry.allow_request(key) is False
 
 
-def test_circuit_breaker_moves_to_half_open_after_timeout(
-    monkeypatch: pytest.MonkeyPatch,
+@pytest.mark.parametrize(
+    "elapsed_seconds,allowed",
+    [(9, False), (11, True)],
+    ids=["before-reset", "half-open-after-reset"],
+)
+def test_circuit_breaker_reopens_for_probe_after_timeout(
+    fake_clock: FakeClock, elapsed_seconds: float, allowed: bool
 ) -> None:
     cfg = CircuitBreakerConfig(failure_threshold=1, reset_timeout_seconds=10)
-    registry = CircuitBreakerRegistry(config=cfg)
+    registry = CircuitBreakerRegistry(config=cfg, clock=fake_clock)
     key = "provider-b"
 
-    fake_time = [1000.0]
+    registry.record_failure(key)
+    assert registry.allow_request(key) is False
+
+    fake_clock.advance(elapsed_seconds)
+    assert registry.allow_request(key) is allowed
 
-    def fake_time_func() -> float:
-        return fake_time[0]
 
-    monkeypatch.setattr("app.services.circuit_breaker.time.time", fake_time_func)
+@pytest.mark.parametrize("recovery_probes", [1, 3])
+def test_circuit_breaker_closes_after_recovery_probes_succeed(
+    fake_clock: FakeClock, recovery_probes: int
+) -> None:
+    cfg = CircuitBreakerConfig(
+        failure_threshold=1,
+        reset_timeout_seconds=5,
+        recovery_probes=recovery_probes,
+    )
+    registry = CircuitBreakerRegistry(config=cfg, clock=fake_clock)
+    key = "provider-c"
 
     registry.record_failure(key)
     assert registry.allow_request(key) is False
 
-    fake_time[0] += 11
+    fake_clock.advance(6)
+    for _ in range(recovery_probes):
+        # Each probe is admitted on its own; the circuit is not yet closed.
+        assert registry.allow_request(key) is True
+        assert registry.allow_request(key) is False
+        registry.record_success(key)
+
+    # Fully recovered: concurrent callers are admitted again.
+    assert registry.allow_request(key) is True
     assert registry.allow_request(key) is True
 
 
-def test_circuit_breaker_resets_on_success_after_half_open(
-    monkeypatch: pytest.MonkeyPatch,
+def test_circuit_breaker_admits_single_probe_in_half_open(
+    fake_clock: FakeClock,
 ) -> None:
     cfg = CircuitBreakerConfig(failure_threshold=1, reset_timeout_seconds=5)
-    registry = CircuitBreakerRegistry(config=cfg)
-    key = "provider-c"
-
-    fake_time = [2000.0]
+    registry = CircuitBreakerRegistry(config=cfg, clock=fake_clock)
+    key = "provider-d"
 
-    def fake_time_func() -> float:
-        return fake_time[0]
+    registry.record_failure(key)
+    fake_clock.advance(6)
 
-    monkeypatch.setattr("app.services.circuit_breaker.time.time", fake_time_func)
+    # Only the first caller after the reset window reaches the provider.
+    assert registry.allow_request(key) is True
+    assert registry.allow_request(key) is False
 
+    # A failed probe re-opens the circuit; the next window admits one again.
     registry.record_failure(key)
     assert registry.allow_request(key) is False
-
-    fake_time[0] += 6
+    fake_clock.advance(6)
     assert registry.allow_request(key) is True
+    assert registry.allow_request(key) is False
 
-    registry.record_success(key)
+    # A probe that never reports back is abandoned after another timeout.
+    fake_clock.advance(6)
     assert registry.allow_request(key) is True
 
 
-def test_rate_limiter_allows_requests_within_window() -> None:
-    cfg = RateLimitConfig(max_requests_per_window=2, window_seconds=60)
-    limiter = RateLimiter(config=cfg)
+@pytest.mark.parametrize(
+    "capacity,window_seconds,elapsed_seconds,admitted_after",
+    [
+        (2, 60, 0, 0),
+        (1, 10, 11, 1),
+        # Half a window refills half the bucket: one more request, not a full
+        # window's worth as a fixed-window limiter would allow at its edge.
+        (2, 10, 5, 1),
+    ],
+    ids=["within-window", "after-full-window", "gradual-refill"],
+)
+def test_rate_limiter_admits_burst_then_refills(
+    fake_clock: FakeClock,
+    capacity: int,
+    window_seconds: float,
+    elapsed_seconds: float,
+    admitted_after: int,
+) -> None:
+    cfg = RateLimitConfig(
+        max_requests_per_window=capacity, window_seconds=window_seconds
+    )
+    limiter = RateLimiter(config=cfg, clock=fake_clock)
     key = "1.2.3.4"
 
-    assert limiter.allow_request(key) is True
-    assert limiter.allow_request(key) is True
+    for _ in range(capacity):
+        assert limiter.allow_request(key) is True
     assert limiter.allow_request(key) is False
 
-
-def test_rate_limiter_resets_after_window(monkeypatch: pytest.MonkeyPatch) -> None:
-    cfg = RateLimitConfig(max_requests_per_window=1, window_seconds=10)
-    limiter = RateLimiter(config=cfg)
-    key = "5.6.7.8"
-
-    fake_time = [1000.0]
-
-    def fake_time_func() -> float:
-        return fake_time[0]
-
-    monkeypatch.setattr("app.services.rate_limiter.time.time", fake_time_func)
-
-    assert limiter.allow_request(key) is True
+    fake_clock.advance(elapsed_seconds)
+    for _ in range(admitted_after):
+        assert limiter.allow_request(key) is True
     assert limiter.allow_request(key) is False
-
-    fake_time[0] += 11
-    assert limiter.allow_request(key) is True
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+try:  # Optional: faster JSON encoding for per-frame WebSocket sends.
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+class SupportsWebSocketSend(Protocol):
+    """The part of a WebSocket the streaming path uses once it is accepted."""
+
+    async def send_json(self, data: Any) -> None:
+        ...
+
+    async def send_text(self, data: str) -> None:
+        ...
+
+    async def send_bytes(self, data: bytes) -> None:
+        ...
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        ...
+
+
+async def send_json_fast(websocket: SupportsWebSocketSend, obj: Any) -> None:
+    """Send ``obj`` as a JSON text frame, encoding with orjson when available.
+
+    Frames stay text (not bytes) so browser clients can keep calling
+    ``JSON.parse(event.data)``; without orjson this is plain ``send_json``.
+    """
+    if orjson is None:
+        await websocket.send_json(obj)
+        return
+    await websocket.send_text(orjson.dumps(obj).decode("utf-8"))
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import json
 from pathlib import Path
 from typing import Any, Dict
@@ -21,6 +20,10 @@ TARGET_FORMAT = "wav"
 SAMPLE_RATE_HZ = 22050
 
 
+# Reuse one keep-alive connection for every session this client creates.
+_http = requests.Session()
+
+
 def create_session() -> Dict[str, Any]:
     """Call POST /v1/tts/sessions and return the JSON response."""
     url = f"{BASE_URL}/v1/tts/sessions"
@@ -32,7 +35,7 @@ def create_session() -> Dict[str, Any]:
         "sample_rate_hz": SAMPLE_RATE_HZ,
         "language": "en-US",
     }
-    resp = requests.post(url, json=payload, timeout=5)
+    resp = _http.post(url, json=payload, timeout=5)
     resp.raise_for_status()
     return resp.json()
 
@@ -40,25 +43,28 @@ def create_session() -> Dict[str, Any]:
 async def stream_audio(ws_url: str, out_path: Path) -> None:
     """Connect to the WebSocket, read all chunks, and write them to a file."""
     print(f"Connecting to WebSocket: {ws_url}")
-    audio_buf = bytearray()
-    async with websockets.connect(ws_url) as ws:
-        while True:
-            message = await ws.recv()
-            data = json.loads(message)
-            msg_type = data.get("type")
-            if msg_type == "audio":
-                chunk_b64 = data["data"]
-                chunk = base64.b64decode(chunk_b64)
-                audio_buf.extend(chunk)
-                print(f"Received chunk seq={data.get('seq')} size={len(chunk)}")
-            elif msg_type == "eos":
-                print("Received end-of-stream")
-                break
-            else:
-                print(f"Unknown message type: {msg_type}")
-
-    out_path.write_bytes(audio_buf)
-    print(f"Wrote {len(audio_buf)} bytes of PCM16 audio to {out_path}")
+    total_bytes = 0
+    # Write each frame as it arrives instead of growing an in-memory buffer
+    # for the whole utterance and copying it out at the end.
+    with out_path.open("wb") as out:
+        async with websockets.connect(ws_url) as ws:
+            while True:
+                message = await ws.recv()
+                # Audio arrives as binary frames; control messages are JSON text.
+                if isinstance(message, (bytes, bytearray)):
+                    out.write(message)
+                    total_bytes += len(message)
+                    print(f"Received chunk size={len(message)}")
+                    continue
+                data = json.loads(message)
+                msg_type = data.get("type")
+                if msg_type == "eos":
+                    print("Received end-of-stream")
+                    break
+                else:
+                    print(f"Unknown message type: {msg_type}")
+
+    print(f"Wrote {total_bytes} bytes of PCM16 audio to {out_path}")
 
 
 def main() -> int:
@@ -40,6 +40,16 @@ interface ErrorMessage {
 
 type WsMessage = AudioMessage | EosMessage | ErrorMessage
 
+// Audio normally arrives as binary frames (no sequence number); the legacy
+// base64 JSON "audio" message is still understood.
+interface AudioFrame {
+  type: 'audio'
+  seq: number | null
+  bytes: Uint8Array
+}
+
+type WsEvent = AudioFrame | EosMessage | ErrorMessage
+
 function App() {
   const [text, setText] = useState('Hello KeyReply – streaming test!')
   const [provider, setProvider] = useState('coqui_tts')
@@ -392,15 +402,16 @@ function App() {
 
     setStatus('Streaming audio...')
     setIsStreaming(true)
+    ws.binaryType = 'arraybuffer'
 
     ws.onopen = () => {
       console.debug('WebSocket opened:', wsUrl)
     }
 
-    ws.onmessage = (event: MessageEvent<string>) => {
-      let msg: WsMessage
+    ws.onmessage = (event: MessageEvent<string | ArrayBuffer>) => {
+      let msg: WsEvent
       try {
-        msg = JSON.parse(event.data) as WsMessage
+        msg = parseWsEvent(event.data)
       } catch (err) {
         console.error('Failed to parse WebSocket message:', err, event.data)
         setLastError('Failed to parse WebSocket message. See console for details.')
@@ -409,15 +420,17 @@ function App() {
       }
       if (msg.type === 'audio') {
         const seq = msg.seq
-        if (lastSeqRef.current != null && seq !== lastSeqRef.current + 1) {
-          const gap = seq - lastSeqRef.current - 1
-          if (gap > 0) {
-            setDroppedNetworkFrames((d) => d + gap)
+        if (seq != null) {
+          if (lastSeqRef.current != null && seq !== lastSeqRef.current + 1) {
+            const gap = seq - lastSeqRef.current - 1
+            if (gap > 0) {
+              setDroppedNetworkFrames((d) => d + gap)
+            }
           }
+          lastSeqRef.current = seq
         }
-        lastSeqRef.current = seq
 
-        const chunkBytes = base64ToBytes(msg.data)
+        const chunkBytes = msg.bytes
         // Live streaming path for PCM16 via Web Audio.
         if (format === 'pcm16') {
           try {
@@ -545,14 +558,15 @@ function App() {
       let totalBytes = 0
       let firstChunkTime: number | null = null
 
+      ws.binaryType = 'arraybuffer'
       ws.onopen = () => {
         console.debug('Stress WebSocket opened:', wsUrl)
       }
 
-      ws.onmessage = (event: MessageEvent<string>) => {
-        let msg: WsMessage
+      ws.onmessage = (event: MessageEvent<string | ArrayBuffer>) => {
+        let msg: WsEvent
         try {
-          msg = JSON.parse(event.data) as WsMessage
+          msg = parseWsEvent(event.data)
         } catch (err) {
           console.error('Stress WS parse error:', err, event.data)
           ws.close()
@@ -560,7 +574,7 @@ function App() {
           return
         }
         if (msg.type === 'audio') {
-          const chunkBytes = base64ToBytes(msg.data)
+          const chunkBytes = msg.bytes
           totalBytes += chunkBytes.length
           setBytes((b) => b + chunkBytes.length)
           setChunks((c) => c + 1)
@@ -695,6 +709,17 @@ async function fetchSessionFile(
   return resp.blob()
 }
 
+function parseWsEvent(data: string | ArrayBuffer): WsEvent {
+  if (data instanceof ArrayBuffer) {
+    return { type: 'audio', seq: null, bytes: new Uint8Array(data) }
+  }
+  const msg = JSON.parse(data) as WsMessage
+  if (msg.type === 'audio') {
+    return { type: 'audio', seq: msg.seq, bytes: base64ToBytes(msg.data) }
+  }
+  return msg
+}
+
 function base64ToBytes(b64: string): Uint8Array {
   const binary = atob(b64)
   const len = binary.length